@@ -0,0 +1,259 @@
+from .Trajectories_Classes import Parameter_Format, Location_Format, Configuration, Location_Aggregate
+
+# Valor del subrango que representa un parámetro NA en la matriz de subrangos
+NA_BIN = -1
+
+class Locations_Index:
+    """
+    Índice espacial de las locaciones para consultas de vecindad y agrupamiento sin comparar códigos de texto.
+
+    Cada locación se guarda como una fila de la matriz de subrangos (bins), con un entero por parámetro y
+    NA_BIN para los valores NA. Por cada parámetro se mantiene un diccionario { subrango: [filas] } (buckets),
+    de modo que una consulta solo revisa las filas de los subrangos dentro del radio del parámetro más selectivo.
+
+    El radio de una consulta se indica en subrangos por parámetro:
+        - Un entero r: las locaciones vecinas difieren a lo más en r subrangos en ese parámetro. Los parámetros
+          categóricos (c) solo coinciden con su misma categoría, mientras que los ordinales (o) usan la distancia
+          entre posiciones. NA solo coincide con NA.
+        - None: el parámetro se ignora (cualquier valor, incluido NA).
+
+    Attributes:
+        parameters_format: Formato de los parámetros del algoritmo
+        locations_format: Formato de las locaciones del algoritmo
+    """
+    # Constructor de la clase
+    def __init__(self, parameters_format: list[Parameter_Format], locations_format: list[Location_Format]):
+        if len(parameters_format) != len(locations_format):
+            raise ValueError("La cantidad de formatos de parámetros y locaciones debe ser la misma.")
+
+        self.parameters_format = parameters_format
+        self.locations_format = locations_format
+
+        # Códigos, matriz de subrangos y acumulados de las locaciones (una fila por locación)
+        self.locations_codes = []
+        self.bins_matrix = []
+        self.locations_aggregates = []
+
+        # Diccionario { código de locación: fila }
+        self.rows = {}
+
+        # Buckets por parámetro
+        # Ejemplo: [ { subrango: [fila, ...], ... }, ... ]
+        self.buckets = [{} for _ in parameters_format]
+
+    # Método para obtener la cantidad de locaciones del índice
+    def __len__(self) -> int:
+        return len(self.locations_codes)
+
+    # Método para saber si una locación está en el índice
+    def __contains__(self, location_code: str) -> bool:
+        return location_code in self.rows
+
+    # Método para obtener la matriz de subrangos
+    def get_bins_matrix(self) -> list[list[int]]:
+        return self.bins_matrix
+
+    # Método para obtener los subrangos de una locación
+    def get_location_bins(self, location_code: str) -> list[int]:
+        return self.bins_matrix[self.rows[location_code]]
+
+    # Método para obtener el acumulado de una locación
+    def get_location_aggregate(self, location_code: str) -> Location_Aggregate:
+        return self.locations_aggregates[self.rows[location_code]]
+
+    # Método para añadir una locación al índice
+    def add_location(self, location_code: str, location_bins: list[int | None], location_aggregate: Location_Aggregate):
+        if location_code in self.rows:
+            return
+        if len(location_bins) != len(self.parameters_format):
+            raise ValueError(f"La cantidad de subrangos de la locación {location_code} no coincide con la cantidad de parámetros.")
+
+        row = len(self.locations_codes)
+        row_bins = [NA_BIN if location_bin is None else location_bin for location_bin in location_bins]
+        self.rows[location_code] = row
+        self.locations_codes.append(location_code)
+        self.bins_matrix.append(row_bins)
+        self.locations_aggregates.append(location_aggregate)
+        for i, location_bin in enumerate(row_bins):
+            self.buckets[i].setdefault(location_bin, []).append(row)
+
+    # Método para añadir una configuración al índice, creando su locación si es necesario
+    def add_configuration(self, configuration: Configuration):
+        location_code = configuration.get_location_code() or configuration.generate_location_code(self.parameters_format, self.locations_format)
+        if location_code not in self.rows:
+            location_bins = configuration.generate_location_bins(self.parameters_format, self.locations_format)
+            self.add_location(location_code, location_bins, Location_Aggregate(location_code))
+        self.get_location_aggregate(location_code).add_configuration(configuration)
+
+    # Método para normalizar el radio a una lista con un valor por parámetro
+    def _radius_list(self, radius: int | dict[str, int | None]) -> list[int | None]:
+        if isinstance(radius, dict):
+            names = [location_format.get_name() for location_format in self.locations_format]
+            unknown_names = set(radius.keys()) - set(names)
+            if unknown_names:
+                raise ValueError(f"Los parámetros {sorted(unknown_names)} no existen en el formato de locaciones.")
+            radius_list = [radius.get(name, 0) for name in names]
+        else:
+            radius_list = [radius] * len(self.locations_format)
+
+        for parameter_radius in radius_list:
+            if parameter_radius is not None and (not isinstance(parameter_radius, int) or parameter_radius < 0):
+                raise ValueError(f"El radio {parameter_radius} no es un entero positivo o None.")
+
+        # Los parámetros categóricos solo coinciden con su misma categoría
+        return [
+            0 if parameter_radius is not None and parameter_format.get_value_type() == 'c' else parameter_radius
+            for parameter_radius, parameter_format in zip(radius_list, self.parameters_format)
+        ]
+
+    # Método para obtener los subrangos aceptados de un parámetro dentro del radio
+    def _bins_in_radius(self, location_bin: int, parameter_radius: int) -> list[int]:
+        if location_bin == NA_BIN:
+            return [NA_BIN]
+        return [location_bin + offset for offset in range(-parameter_radius, parameter_radius + 1) if location_bin + offset >= 0]
+
+    # Método para verificar si una fila está dentro del radio de los subrangos dados
+    def _in_radius(self, row_bins: list[int], location_bins: list[int], radius_list: list[int | None]) -> bool:
+        for row_bin, location_bin, parameter_radius in zip(row_bins, location_bins, radius_list):
+            if parameter_radius is None:
+                continue
+            if row_bin == NA_BIN or location_bin == NA_BIN:
+                if row_bin != location_bin:
+                    return False
+            elif abs(row_bin - location_bin) > parameter_radius:
+                return False
+        return True
+
+    # Método para obtener las filas vecinas de unos subrangos
+    def _neighbour_rows(self, location_bins: list[int], radius_list: list[int | None]) -> list[int]:
+
+        # Se elige el parámetro con menos candidatos para recorrer sus buckets
+        best_parameter = None
+        best_count = len(self.locations_codes) + 1
+        for i, parameter_radius in enumerate(radius_list):
+            if parameter_radius is None:
+                continue
+            count = sum(len(self.buckets[i].get(location_bin, [])) for location_bin in self._bins_in_radius(location_bins[i], parameter_radius))
+            if count < best_count:
+                best_parameter, best_count = i, count
+
+        if best_parameter is None:
+            candidates = range(len(self.locations_codes))
+        else:
+            candidates = [
+                row
+                for location_bin in self._bins_in_radius(location_bins[best_parameter], radius_list[best_parameter])
+                for row in self.buckets[best_parameter].get(location_bin, [])
+            ]
+
+        return [row for row in candidates if self._in_radius(self.bins_matrix[row], location_bins, radius_list)]
+
+    # Método para obtener las locaciones vecinas de una locación
+    def neighbours(self, location_code: str, radius: int | dict[str, int | None] = 1) -> list[str]:
+        """
+        Obtiene las locaciones del índice que están dentro del radio (en subrangos) de una locación.
+
+        Args:
+            location_code (str): Código de la locación a consultar.
+            radius (int | dict): Radio en subrangos para todos los parámetros, o diccionario
+                { parámetro: radio | None } (los parámetros no indicados usan radio 0).
+
+        Returns:
+            list[str]: Códigos de las locaciones vecinas, sin incluir la locación consultada.
+        """
+        if location_code not in self.rows:
+            raise ValueError(f"La locación {location_code} no está en el índice.")
+
+        row = self.rows[location_code]
+        neighbour_rows = self._neighbour_rows(self.bins_matrix[row], self._radius_list(radius))
+        return [self.locations_codes[neighbour_row] for neighbour_row in neighbour_rows if neighbour_row != row]
+
+    # Método para agrupar locaciones vecinas en super-locaciones
+    def coarsen(self, radius: int | dict[str, int | None] = 1) -> tuple[dict[str, str], dict[str, Location_Aggregate]]:
+        """
+        Agrupa las locaciones vecinas en super-locaciones, recalculando sus acumulados sin releer las trayectorias.
+
+        Las locaciones se recorren priorizando las élites y luego las que tienen más configuraciones; cada locación
+        aún no asignada pasa a ser el centro de una super-locación (con su mismo código) y absorbe a sus vecinas no
+        asignadas dentro del radio. Al usar centros, el agrupamiento no se encadena más allá del radio.
+
+        Args:
+            radius (int | dict): Radio en subrangos, con el mismo formato que en neighbours().
+
+        Returns:
+            tuple: Diccionario { locación: super-locación } y diccionario { super-locación: Location_Aggregate }.
+        """
+        radius_list = self._radius_list(radius)
+
+        order = sorted(
+            range(len(self.locations_codes)),
+            key=lambda row: (self.locations_aggregates[row].get_elite_state() != 'e', -self.locations_aggregates[row].get_count(), self.locations_codes[row])
+        )
+
+        locations_mapping = {}
+        super_locations_aggregates = {}
+        for row in order:
+            location_code = self.locations_codes[row]
+            if location_code in locations_mapping:
+                continue
+
+            super_location_aggregate = Location_Aggregate(location_code)
+            for neighbour_row in self._neighbour_rows(self.bins_matrix[row], radius_list):
+                neighbour_code = self.locations_codes[neighbour_row]
+                if neighbour_code in locations_mapping:
+                    continue
+                locations_mapping[neighbour_code] = location_code
+                super_location_aggregate.merge(self.locations_aggregates[neighbour_row])
+
+            super_locations_aggregates[location_code] = super_location_aggregate
+
+        return locations_mapping, super_locations_aggregates
+
+# Función para reemplazar las locaciones de un archivo en formato STN por sus super-locaciones
+def coarsen_stn_lines(
+    stn_lines: list[str],
+    locations_mapping: dict[str, str],
+    super_locations_aggregates: dict[str, Location_Aggregate],
+    quality_type: str,
+    significant_digits: int
+) -> list[str]:
+    """
+    Reescribe las líneas en formato STN reemplazando cada locación por su super-locación, con la calidad y el
+    estado élite de la super-locación. Las demás columnas (iteraciones, configuraciones) se mantienen.
+
+    Args:
+        stn_lines (list[str]): Líneas en formato STN, incluyendo el encabezado.
+        locations_mapping (dict): Diccionario { locación: super-locación } obtenido con Locations_Index.coarsen().
+        super_locations_aggregates (dict): Diccionario { super-locación: Location_Aggregate }.
+        quality_type (str) : Tipo de calidad a considerar para las super-locaciones ('mean', 'min' o 'max').
+        significant_digits (int) : Cantidad de dígitos significativos para la calidad.
+
+    Returns:
+        list[str]: Líneas en formato STN con las super-locaciones.
+    """
+    if len(stn_lines) == 0:
+        return []
+
+    # Se obtienen las columnas de calidad, locación y élite de origen y destino
+    header = stn_lines[0].split()
+    columns = [
+        (header.index(f"Fitness{i}"), header.index(f"Solution{i}"), header.index(f"Elite{i}") if f"Elite{i}" in header else None)
+        for i in range(1, 3)
+    ]
+
+    coarsened_lines = [stn_lines[0]]
+    for line in stn_lines[1:]:
+        values = line.split()
+        for fitness_column, solution_column, elite_column in columns:
+            super_location_code = locations_mapping[values[solution_column]]
+            super_location_aggregate = super_locations_aggregates[super_location_code]
+            quality = super_location_aggregate.get_quality(quality_type)
+
+            values[solution_column] = super_location_code
+            values[fitness_column] = str(int(quality)) if significant_digits == 0 else f'{quality:.{significant_digits}f}'
+            if elite_column is not None:
+                values[elite_column] = 'T' if super_location_aggregate.get_elite_state() == 'e' else 'F'
+
+        coarsened_lines.append(" ".join(values))
+
+    return coarsened_lines
@@ -0,0 +1,102 @@
+import os, pickle, hashlib
+from .Trajectories_Classes import Configuration
+
+# Función para obtener la ruta del checkpoint de un archivo de trayectorias
+def get_checkpoint_file_path(
+    checkpoint_path: str,
+    file_path: str
+) -> str:
+    """
+    Obtiene la ruta del checkpoint de un archivo de trayectorias dentro de la carpeta de checkpoints.
+    El nombre incluye un hash de la ruta absoluta para distinguir archivos con el mismo nombre en otras carpetas.
+    """
+    absolute_file_path = os.path.abspath(file_path)
+    file_hash = hashlib.sha1(absolute_file_path.encode()).hexdigest()[:16]
+    return os.path.join(checkpoint_path, f'{os.path.basename(file_path)}.{file_hash}.checkpoint')
+
+# Función para guardar el checkpoint de un archivo de trayectorias procesado
+def save_trajectories_checkpoint(
+    checkpoint_path: str,
+    file_path: str,
+    formats_signature: str,
+    iterations_trajectory_list: list[list[tuple[Configuration, Configuration]]],
+    skipped_lines: list[tuple[str, int, str]],
+    file_stat: os.stat_result | None = None
+):
+    """
+    Guarda de forma atómica las trayectorias localizadas de un archivo y las líneas omitidas, junto con el tamaño
+    y la fecha de modificación del archivo y la firma de los formatos, para poder reanudar la conversión.
+    El tamaño y la fecha deben ser los obtenidos antes de leer el archivo, para que un archivo que creció
+    mientras se procesaba no se reanude con trayectorias incompletas.
+
+    Args:
+        checkpoint_path (str): Carpeta de los checkpoints.
+        file_path (str): Ruta del archivo de trayectorias.
+        formats_signature (str): Firma de los formatos de parámetros y locaciones.
+        iterations_trajectory_list (list): Lista de iteraciones con las trayectorias (origen, destino) localizadas.
+        skipped_lines (list): Líneas omitidas del archivo [(ruta, línea, mensaje), ...].
+        file_stat (os.stat_result): Tamaño y fecha de modificación del archivo antes de leerlo (None para obtenerlos ahora).
+    """
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+    checkpoint = {
+        'file_path': os.path.abspath(file_path),
+        'file_size': file_stat.st_size,
+        'file_mtime': file_stat.st_mtime,
+        'formats_signature': formats_signature,
+        'skipped_lines': skipped_lines,
+        'iterations_trajectory_list': iterations_trajectory_list,
+    }
+
+    checkpoint_file_path = get_checkpoint_file_path(checkpoint_path, file_path)
+    temporary_file_path = f'{checkpoint_file_path}.tmp'
+    with open(temporary_file_path, 'wb') as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file_path, checkpoint_file_path)
+
+# Función para cargar el checkpoint de un archivo de trayectorias
+def load_trajectories_checkpoint(
+    checkpoint_path: str,
+    file_path: str,
+    file_index: int,
+    formats_signature: str
+) -> tuple[list[list[tuple[Configuration, Configuration]]], list[tuple[str, int, str]]] | None:
+    """
+    Carga el checkpoint de un archivo de trayectorias si existe y sigue siendo válido, es decir, si el archivo no
+    cambió (tamaño y fecha de modificación) y los formatos son los mismos.
+
+    Args:
+        checkpoint_path (str): Carpeta de los checkpoints.
+        file_path (str): Ruta del archivo de trayectorias.
+        file_index (int): Número de ejecución que se asigna a las configuraciones cargadas.
+        formats_signature (str): Firma de los formatos de parámetros y locaciones.
+
+    Returns:
+        tuple | None: Lista de iteraciones con las trayectorias y líneas omitidas, o None si no hay un checkpoint válido.
+    """
+    checkpoint_file_path = get_checkpoint_file_path(checkpoint_path, file_path)
+    if not os.path.isfile(checkpoint_file_path):
+        return None
+
+    try:
+        with open(checkpoint_file_path, 'rb') as file:
+            checkpoint = pickle.load(file)
+    except Exception as e:
+        print(f'Advertencia: no se pudo leer el checkpoint {checkpoint_file_path} ({e}), se reprocesa el archivo.')
+        return None
+
+    file_stat = os.stat(file_path)
+    if (checkpoint.get('file_path') != os.path.abspath(file_path)
+            or checkpoint.get('file_size') != file_stat.st_size
+            or checkpoint.get('file_mtime') != file_stat.st_mtime
+            or checkpoint.get('formats_signature') != formats_signature):
+        return None
+
+    # Se actualiza el número de ejecución, que depende de los archivos procesados antes
+    iterations_trajectory_list = checkpoint['iterations_trajectory_list']
+    for trajectory_list in iterations_trajectory_list:
+        for trajectory in trajectory_list:
+            for configuration in trajectory:
+                configuration.set_run(file_index)
+
+    return iterations_trajectory_list, checkpoint['skipped_lines']
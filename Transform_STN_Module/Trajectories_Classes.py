@@ -268,6 +268,38 @@ class Location_Format:
         except ValueError as e:
             raise ValueError(f"Error en el casteo de parámetro '{parameter.get_name()}': {e}")
 
+    # Método para obtener el índice del subrango (bin) de un parámetro, None si el valor es NA
+    def bin_parameter(self, parameter: Parameter, parameter_format: Parameter_Format) -> int | None:
+        try:
+            # Verifica si el nombre del parámetro coincide
+            if parameter.get_name() != self.name:
+                raise ValueError(f"El nombre del parámetro {parameter.get_name()} no coincide con {self.name}")
+
+            value = parameter.get_value()
+
+            # Parámetro None o NA (categoría propia)
+            if value is None or value == "NA":
+                return None
+
+            # Parámetro categorico u ordinal (c|o): posición del código de locación entre los códigos distintos
+            elif parameter_format.get_value_type() in ['c', 'o']:
+                if not isinstance(self.location_caster, dict):
+                    raise ValueError(f"El formato de locación no es un diccionario para el parámetro {self.name}")
+                elif value not in self.location_caster.keys():
+                    raise ValueError(f"El valor {value} no está en los valores posibles del parámetro {self.name}")
+                location_codes = list(dict.fromkeys(code for key, code in self.location_caster.items() if key != "NA"))
+                return location_codes.index(self.location_caster[value])
+
+            # Parámetro numérico (real|entero) (r|i): índice del subrango, igual que en locate_parameter
+            elif parameter_format.get_value_type() in ['r', 'i']:
+                lower_bound, _ = parameter_format.get_possible_values()
+                division, _ = self.location_caster
+                return int((value - lower_bound) // division)
+            else:
+                raise ValueError(f"Tipo no soportado: {parameter_format.get_value_type()}")
+        except ValueError as e:
+            raise ValueError(f"Error en el casteo de parámetro '{parameter.get_name()}': {e}")
+
 class Configuration:
     # Clase para definir una configuración.
     def __init__(self, id: int = 0, run: int = 0, iteration: int = 0, parameters: list[Parameter] = [], elite_state : str = '', quality: int | float = 0, location_code: str = ""):
@@ -381,3 +413,95 @@ class Configuration:
         except ValueError as e:
             raise ValueError(f"Error al generar el código de la locación: {e}")
 
+    # Método para generar los índices de subrango (bins) de los parámetros de la configuración
+    def generate_location_bins(self, parameters_format: list[Parameter_Format], locations_format: list[Location_Format]) -> list[int | None]:
+        try:
+            # Verifica si el número de parámetros coincide con el número de formatos de locación
+            if len(locations_format) != len(self.parameters):
+                raise ValueError("Error en el número de parámetros al generar los subrangos de la locación")
+            elif len(parameters_format) != len(self.parameters):
+                raise ValueError("Error en el número de formatos de parámetros al generar los subrangos de la locación")
+
+            return [location_format.bin_parameter(self.parameters[i], parameters_format[i]) for i, location_format in enumerate(locations_format)]
+        except ValueError as e:
+            raise ValueError(f"Error al generar los subrangos de la locación: {e}")
+
+class Location_Aggregate:
+    # Clase para acumular las calidades y el estado élite de las configuraciones de una locación.
+    def __init__(self, location_code: str = ""):
+        """
+        Constructor de la clase Location_Aggregate.
+
+        Args:
+            location_code: Código de la locación
+        """
+        self.location_code = location_code
+        self.count = 0
+        self.quality_sum = 0
+        self.quality_min = None
+        self.quality_max = None
+        self.elite_state = 'ne'
+
+    # Método para obtener el código de la locación
+    def get_location_code(self) -> str:
+        return self.location_code
+
+    # Método para obtener la cantidad de configuraciones de la locación
+    def get_count(self) -> int:
+        return self.count
+
+    # Método para obtener la suma de las calidades de la locación
+    def get_quality_sum(self) -> int | float:
+        return self.quality_sum
+
+    # Método para obtener el estado élite de la locación
+    def get_elite_state(self) -> str:
+        return self.elite_state
+
+    # Método para establecer el código de la locación
+    def set_location_code(self, location_code: str):
+        self.location_code = location_code
+
+    # Método para establecer el estado élite de la locación
+    def set_elite_state(self, elite_state: str):
+        self.elite_state = elite_state
+
+    # Método para añadir una calidad y un estado élite a la locación
+    def add_quality(self, quality: int | float, elite_state: str = 'ne'):
+        self.count += 1
+        self.quality_sum += quality
+        if self.quality_min is None or quality < self.quality_min:
+            self.quality_min = quality
+        if self.quality_max is None or quality > self.quality_max:
+            self.quality_max = quality
+        if elite_state == 'e':
+            self.elite_state = 'e'
+
+    # Método para añadir una configuración a la locación
+    def add_configuration(self, configuration: Configuration):
+        self.add_quality(configuration.get_quality(), configuration.get_elite_state())
+
+    # Método para combinar otra locación en la actual
+    def merge(self, other: "Location_Aggregate"):
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.quality_sum += other.quality_sum
+        if self.quality_min is None or other.quality_min < self.quality_min:
+            self.quality_min = other.quality_min
+        if self.quality_max is None or other.quality_max > self.quality_max:
+            self.quality_max = other.quality_max
+        if other.elite_state == 'e':
+            self.elite_state = 'e'
+
+    # Método para obtener la calidad de la locación según el tipo de calidad (min|max|mean)
+    def get_quality(self, quality_type: str) -> int | float:
+        if self.count == 0:
+            raise ValueError(f"La locación {self.location_code} no tiene configuraciones")
+        if quality_type == 'min':
+            return self.quality_min
+        elif quality_type == 'max':
+            return self.quality_max
+        elif quality_type == 'mean':
+            return self.quality_sum / self.count
+        raise ValueError(f"El tipo de calidad '{quality_type}' no es válido.")
@@ -0,0 +1,297 @@
+import os, sqlite3
+from .Trajectories_Classes import Parameter_Format, Location_Format, Configuration, Location_Aggregate
+
+# Versión del esquema de la base de datos de trayectorias
+TRAJECTORIES_DATABASE_VERSION = '3'
+
+# Esquema normalizado de la base de datos de trayectorias
+# El rol de un estado indica si la calidad es la del bloque de origen (élites) o de destino (nuevos resultados)
+TRAJECTORIES_DATABASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL UNIQUE,
+    file_size INTEGER NOT NULL,
+    file_mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configurations (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    configuration_id INTEGER NOT NULL,
+    location_code TEXT NOT NULL,
+    PRIMARY KEY (run_id, configuration_id)
+);
+CREATE TABLE IF NOT EXISTS configuration_parameters (
+    run_id INTEGER NOT NULL,
+    configuration_id INTEGER NOT NULL,
+    parameter_name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (run_id, configuration_id, parameter_name),
+    FOREIGN KEY (run_id, configuration_id) REFERENCES configurations(run_id, configuration_id)
+);
+CREATE TABLE IF NOT EXISTS configuration_states (
+    run_id INTEGER NOT NULL,
+    configuration_id INTEGER NOT NULL,
+    iteration INTEGER NOT NULL,
+    role TEXT NOT NULL CHECK (role IN ('origin', 'destination')),
+    elite_state TEXT NOT NULL,
+    quality REAL NOT NULL,
+    PRIMARY KEY (run_id, configuration_id, iteration, role),
+    FOREIGN KEY (run_id, configuration_id) REFERENCES configurations(run_id, configuration_id)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    transition_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    iteration INTEGER NOT NULL,
+    origin_configuration_id INTEGER NOT NULL,
+    destination_configuration_id INTEGER NOT NULL,
+    origin_location_code TEXT NOT NULL,
+    destination_location_code TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_locations (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    location_code TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    quality_sum REAL NOT NULL,
+    quality_min REAL NOT NULL,
+    quality_max REAL NOT NULL,
+    elite_state TEXT NOT NULL,
+    PRIMARY KEY (run_id, location_code)
+);
+CREATE TABLE IF NOT EXISTS locations (
+    location_code TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    quality_sum REAL NOT NULL,
+    quality_min REAL NOT NULL,
+    quality_max REAL NOT NULL,
+    elite_state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_locations_location_index ON run_locations(location_code);
+CREATE INDEX IF NOT EXISTS configurations_location_index ON configurations(location_code);
+CREATE INDEX IF NOT EXISTS configurations_id_index ON configurations(configuration_id);
+CREATE INDEX IF NOT EXISTS configuration_states_iteration_index ON configuration_states(run_id, iteration);
+CREATE INDEX IF NOT EXISTS transitions_run_iteration_index ON transitions(run_id, iteration);
+CREATE INDEX IF NOT EXISTS transitions_origin_location_index ON transitions(origin_location_code);
+CREATE INDEX IF NOT EXISTS transitions_destination_location_index ON transitions(destination_location_code);
+CREATE INDEX IF NOT EXISTS transitions_origin_configuration_index ON transitions(run_id, origin_configuration_id);
+CREATE INDEX IF NOT EXISTS transitions_destination_configuration_index ON transitions(run_id, destination_configuration_id);
+CREATE VIEW IF NOT EXISTS locations_quality AS
+    SELECT location_code, count, quality_min, quality_max, quality_sum / count AS quality_mean, elite_state FROM locations;
+"""
+
+# Función para obtener la firma de los formatos con los que se construye la base de datos
+def get_formats_signature(
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ]
+) -> str:
+    """
+    Genera una firma de texto de los formatos de parámetros y locaciones, para evitar mezclar en una misma
+    base de datos locaciones generadas con formatos distintos.
+    """
+    parameters_signature = [(f.get_name(), f.get_type(), f.get_value_type(), f.get_possible_values()) for f in parameters_format]
+    locations_signature = [(f.get_name(), f.get_location_caster()) for f in locations_format]
+    return repr((parameters_signature, locations_signature))
+
+# Función para abrir (o crear) la base de datos de trayectorias
+def open_trajectories_database(
+    database_path: str,
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ]
+) -> sqlite3.Connection:
+    """
+    Abre la base de datos SQLite de trayectorias, creando el esquema si no existe y verificando que fue
+    construida con la misma versión del esquema y los mismos formatos de parámetros y locaciones.
+
+    Args:
+        database_path (str): Ruta del archivo de la base de datos.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+
+    Returns:
+        sqlite3.Connection: Conexión a la base de datos.
+    """
+    connection = sqlite3.connect(database_path)
+    try:
+        with connection:
+            connection.executescript(TRAJECTORIES_DATABASE_SCHEMA)
+            formats_signature = get_formats_signature(parameters_format, locations_format)
+            metadata = dict(connection.execute("SELECT key, value FROM metadata").fetchall())
+            if not metadata:
+                connection.executemany(
+                    "INSERT INTO metadata (key, value) VALUES (?, ?)",
+                    [('schema_version', TRAJECTORIES_DATABASE_VERSION), ('formats_signature', formats_signature)]
+                )
+            elif metadata.get('schema_version') != TRAJECTORIES_DATABASE_VERSION:
+                raise ValueError(f"La base de datos '{database_path}' fue construida con otra versión del esquema, se debe volver a generar.")
+            elif metadata.get('formats_signature') != formats_signature:
+                raise ValueError(f"La base de datos '{database_path}' fue construida con otros formatos de parámetros o locaciones.")
+    except Exception:
+        connection.close()
+        raise
+    return connection
+
+# Función para saber si un archivo ya fue insertado en la base de datos
+def is_trajectories_file_inserted(
+    connection: sqlite3.Connection,
+    file_path: str,
+    file_stat: os.stat_result | None = None
+) -> bool:
+    """
+    Indica si las trayectorias de un archivo ya están en la base de datos y el archivo no cambió desde entonces
+    (mismo tamaño y fecha de modificación), para construirla de forma incremental. Un archivo que creció o fue
+    corregido se considera no insertado, para que insert_trajectories_file() reemplace su ejecución.
+    file_stat debe ser el obtenido antes de leer el archivo (None para obtenerlo ahora).
+    """
+    row = connection.execute("SELECT file_size, file_mtime FROM runs WHERE file_path = ?", (file_path,)).fetchone()
+    if row is None:
+        return False
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+    return row[0] == file_stat.st_size and row[1] == file_stat.st_mtime
+
+# Función para eliminar una ejecución de la base de datos, dentro de una transacción abierta
+def delete_trajectories_run(
+    connection: sqlite3.Connection,
+    run_id: int
+):
+    """
+    Elimina las filas de una ejecución y recalcula, a partir de los acumulados por ejecución, los acumulados de
+    las locaciones en que aparecía (eliminando las que quedan sin configuraciones). No confirma la transacción.
+    """
+    location_codes = [row[0] for row in connection.execute("SELECT location_code FROM run_locations WHERE run_id = ?", (run_id,))]
+
+    for table in ('transitions', 'configuration_states', 'configuration_parameters', 'configurations', 'run_locations'):
+        connection.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    connection.executemany("DELETE FROM locations WHERE location_code = ?", [(location_code,) for location_code in location_codes])
+    connection.executemany(
+        """
+        INSERT INTO locations (location_code, count, quality_sum, quality_min, quality_max, elite_state)
+        SELECT location_code, SUM(count), SUM(quality_sum), MIN(quality_min), MAX(quality_max),
+            CASE WHEN SUM(elite_state = 'e') > 0 THEN 'e' ELSE 'ne' END
+        FROM run_locations WHERE location_code = ? GROUP BY location_code
+        """,
+        [(location_code,) for location_code in location_codes]
+    )
+
+# Función para insertar las trayectorias de un archivo en la base de datos
+def insert_trajectories_file(
+    connection: sqlite3.Connection,
+    file_path: str,
+    iterations_trajectory_list: list[list[tuple[Configuration, Configuration]]],
+    file_stat: os.stat_result | None = None
+) -> int:
+    """
+    Inserta las configuraciones, transiciones y acumulados de locaciones de un archivo en una sola transacción,
+    usando inserciones por lotes. Las configuraciones deben tener su código de locación generado.
+
+    Si el archivo ya tenía una ejecución en la base de datos (porque creció o fue corregido), en la misma
+    transacción se eliminan sus filas y se recalculan sus locaciones antes de insertarlo con el mismo
+    identificador, de modo que un error no deja la ejecución a medias.
+
+    Args:
+        connection (sqlite3.Connection): Conexión a la base de datos.
+        file_path (str): Ruta del archivo de trayectorias (identifica la ejecución).
+        iterations_trajectory_list (list): Lista de iteraciones con las trayectorias (origen, destino) del archivo.
+        file_stat (os.stat_result): Tamaño y fecha de modificación del archivo al leerlo (None para obtenerlos ahora).
+
+    Returns:
+        int: Identificador de la ejecución insertada.
+    """
+    # Filas de las tablas, agrupando las configuraciones repetidas del archivo
+    # Ejemplo: { id: Configuration, ... } y { (id, iteración, rol): [estado elite, calidad], ... }
+    configurations = {}
+    configurations_states = {}
+    transitions_rows = []
+    locations_aggregates = {}
+
+    for trajectory_list in iterations_trajectory_list:
+        for origin_configuration, destination_configuration in trajectory_list:
+            for role, configuration in (('origin', origin_configuration), ('destination', destination_configuration)):
+                location_code = configuration.get_location_code()
+                if location_code == '':
+                    raise ValueError(f"La configuración {configuration.get_id()} del archivo '{file_path}' no tiene código de locación.")
+
+                configurations.setdefault(configuration.get_id(), configuration)
+
+                state_key = (configuration.get_id(), configuration.get_iteration(), role)
+                if state_key not in configurations_states or configuration.get_elite_state() == 'e':
+                    configurations_states[state_key] = [configuration.get_elite_state(), configuration.get_quality()]
+
+                if location_code not in locations_aggregates:
+                    locations_aggregates[location_code] = Location_Aggregate(location_code)
+                locations_aggregates[location_code].add_configuration(configuration)
+
+            transitions_rows.append((
+                origin_configuration.get_iteration(),
+                origin_configuration.get_id(),
+                destination_configuration.get_id(),
+                origin_configuration.get_location_code(),
+                destination_configuration.get_location_code(),
+            ))
+
+    if file_stat is None:
+        file_stat = os.stat(file_path)
+
+    # Reemplazo e inserción en una sola transacción
+    with connection:
+        row = connection.execute("SELECT run_id FROM runs WHERE file_path = ?", (file_path,)).fetchone()
+        if row is None:
+            run_id = connection.execute(
+                "INSERT INTO runs (file_path, file_size, file_mtime) VALUES (?, ?, ?)",
+                (file_path, file_stat.st_size, file_stat.st_mtime)
+            ).lastrowid
+        else:
+            run_id = row[0]
+            delete_trajectories_run(connection, run_id)
+            connection.execute(
+                "UPDATE runs SET file_size = ?, file_mtime = ? WHERE run_id = ?",
+                (file_stat.st_size, file_stat.st_mtime, run_id)
+            )
+
+        connection.executemany(
+            "INSERT INTO configurations (run_id, configuration_id, location_code) VALUES (?, ?, ?)",
+            [(run_id, configuration_id, configuration.get_location_code()) for configuration_id, configuration in configurations.items()]
+        )
+        connection.executemany(
+            "INSERT INTO configuration_parameters (run_id, configuration_id, parameter_name, value) VALUES (?, ?, ?, ?)",
+            [
+                (run_id, configuration_id, parameter.get_name(), parameter.get_value())
+                for configuration_id, configuration in configurations.items()
+                for parameter in configuration.get_parameters()
+            ]
+        )
+        connection.executemany(
+            "INSERT INTO configuration_states (run_id, configuration_id, iteration, role, elite_state, quality) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, configuration_id, iteration, role, elite_state, quality) for (configuration_id, iteration, role), (elite_state, quality) in configurations_states.items()]
+        )
+        connection.executemany(
+            "INSERT INTO transitions (run_id, iteration, origin_configuration_id, destination_configuration_id, origin_location_code, destination_location_code) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id,) + transition_row for transition_row in transitions_rows]
+        )
+        connection.executemany(
+            "INSERT INTO run_locations (run_id, location_code, count, quality_sum, quality_min, quality_max, elite_state) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, location_code, aggregate.get_count(), aggregate.get_quality_sum(), aggregate.get_quality('min'), aggregate.get_quality('max'), aggregate.get_elite_state())
+                for location_code, aggregate in locations_aggregates.items()
+            ]
+        )
+        connection.executemany(
+            """
+            INSERT INTO locations (location_code, count, quality_sum, quality_min, quality_max, elite_state) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (location_code) DO UPDATE SET
+                count = count + excluded.count,
+                quality_sum = quality_sum + excluded.quality_sum,
+                quality_min = MIN(quality_min, excluded.quality_min),
+                quality_max = MAX(quality_max, excluded.quality_max),
+                elite_state = CASE WHEN excluded.elite_state = 'e' THEN 'e' ELSE elite_state END
+            """,
+            [
+                (location_code, aggregate.get_count(), aggregate.get_quality_sum(), aggregate.get_quality('min'), aggregate.get_quality('max'), aggregate.get_elite_state())
+                for location_code, aggregate in locations_aggregates.items()
+            ]
+        )
+
+    return run_id
@@ -1,5 +1,8 @@
 import os, re, time
-from .Trajectories_Classes import Parameter, Parameter_Format, Location_Format, Configuration
+from .Trajectories_Classes import Parameter, Parameter_Format, Location_Format, Configuration, Location_Aggregate
+from .Locations_Index import Locations_Index
+from .Trajectories_Database import open_trajectories_database, is_trajectories_file_inserted, insert_trajectories_file, get_formats_signature
+from .Trajectories_Checkpoint import save_trajectories_checkpoint, load_trajectories_checkpoint
 
 # Función para leer los archivos de una carpeta
 def read_trajectories_files_folder(
@@ -24,6 +27,346 @@ def read_trajectories_files_folder(
 
     return file_paths
 
+# Función para validar los argumentos comunes de la conversión a formato STN
+def validate_stn_arguments(
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ],
+    quality_type: str,
+    significant_digits: int,
+    show_elites: bool
+):
+    """
+    Valida los formatos y opciones comunes de la conversión de trayectorias a formato STN.
+
+    Args:
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+        quality_type (str) : Tipo de calidad a considerar para las locaciones ('mean', 'min' o 'max').
+        significant_digits (int) : Cantidad de dígitos significativos para la calidad.
+        show_elites (bool) : Indica si se deben mostrar las configuraciones élites en el archivo STN.
+    """
+    # Validación de tamaños de listas
+    if len(parameters_format) == 0:
+        raise ValueError("La lista de formatos de parámetros no puede estar vacía.")
+    elif len(locations_format) == 0:
+        raise ValueError("La lista de formatos de locaciones no puede estar vacía.")
+    elif len(parameters_format) != len(locations_format):
+        raise ValueError("La cantidad de formatos de parámetros y locaciones debe ser la misma.")
+
+    # Validación de los formatos de los otros parámetros
+    if quality_type not in ['mean', 'min', 'max']:
+        raise ValueError(f"El tipo de calidad '{quality_type}' no es válido.")
+    elif significant_digits < 0:
+        raise ValueError("La cantidad de dígitos significativos no puede ser negativa.")
+    elif not isinstance(show_elites, bool):
+        raise ValueError("El valor de mostrar élites debe ser un valor booleano.")
+
+# Función para convertir un bloque de texto en una configuración
+def parse_configuration_block(
+    block: str,
+    parameters_format: list[ Parameter_Format ],
+    run: int,
+    file_path: str,
+    line_index: int
+) -> Configuration:
+    """
+    Convierte un bloque de una línea de trayectorias (origen o destino) en una configuración.
+
+    Args:
+        block (str): Bloque de texto con el id, los parámetros, el estado élite, la iteración y la calidad.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        run (int): Índice de la ejecución (archivo) a la que pertenece la configuración.
+        file_path (str): Ruta del archivo, usada en los mensajes de error.
+        line_index (int): Índice de la línea, usado en los mensajes de error.
+
+    Returns:
+        Configuration: Configuración con los parámetros casteados y sin código de locación.
+    """
+    configuration_values = block.split()
+    configuration_length = len(configuration_values)
+    if configuration_length != 4 + len(parameters_format):
+        raise ValueError(f"El archivo '{file_path}' no contiene la cantidad correcta de parámetros en la línea {line_index}.")
+
+    # Se obtiene la información de la configuración
+    configuration_id = int(configuration_values[0])
+    parameters_pre_cast = configuration_values[1:configuration_length - 3]
+    parameters = []
+    for k, parameter_value in enumerate(parameters_pre_cast):
+        parameter_format = parameters_format[k]
+        parameter = Parameter(parameter_format.get_name(), parameter_value)
+        parameter.set_value(parameter_format.cast_parameter_value(parameter))
+        parameters.append(parameter)
+    elite_state = configuration_values[configuration_length - 3]
+    iteration = int(configuration_values[configuration_length - 2])
+    quality = float(configuration_values[configuration_length - 1])
+
+    return Configuration(id=configuration_id, run=run, iteration=iteration, parameters=parameters, elite_state=elite_state, quality=quality, location_code='')
+
+# Función para convertir una línea de trayectorias en un par de configuraciones (origen, destino)
+def parse_trajectory_line(
+    line: str,
+    parameters_format: list[ Parameter_Format ],
+    run: int,
+    file_path: str,
+    line_index: int
+) -> tuple[Configuration, Configuration]:
+    """
+    Convierte una línea de un archivo de trayectorias en la configuración de origen y la de destino.
+
+    Args:
+        line (str): Línea del archivo de trayectorias (sin el encabezado).
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        run (int): Índice de la ejecución (archivo) a la que pertenece la línea.
+        file_path (str): Ruta del archivo, usada en los mensajes de error.
+        line_index (int): Índice de la línea, usado en los mensajes de error.
+
+    Returns:
+        tuple[Configuration, Configuration]: Configuraciones de origen y destino.
+    """
+    # Se obtienen ambos bloques de configuraciones (origen y destino)
+    trajectory_blocks = line.split('|')
+    if len(trajectory_blocks) != 2:
+        raise ValueError(f"El archivo '{file_path}' no contiene dos bloques de trayectorias en la línea {line_index}.")
+
+    origin_configuration = parse_configuration_block(trajectory_blocks[0], parameters_format, run, file_path, line_index)
+    destination_configuration = parse_configuration_block(trajectory_blocks[1], parameters_format, run, file_path, line_index)
+
+    return origin_configuration, destination_configuration
+
+# Función para calcular la calidad y el estado élite de las locaciones
+def calculate_locations_quality(
+    locations_aggregates: dict[str, Location_Aggregate],
+    quality_type: str
+) -> dict[str, list]:
+    """
+    Calcula la calidad y el estado élite de cada locación a partir de sus acumulados.
+
+    Args:
+        locations_aggregates (dict): Diccionario { locación: Location_Aggregate }.
+        quality_type (str) : Tipo de calidad a considerar para las locaciones ('mean', 'min' o 'max').
+
+    Returns:
+        dict: Diccionario { locación: [calidad, estado elite] }.
+    """
+    return {
+        location_code: [location_aggregate.get_quality(quality_type), location_aggregate.get_elite_state()]
+        for location_code, location_aggregate in locations_aggregates.items()
+    }
+
+# Función para generar el encabezado del archivo en formato STN
+def generate_stn_header(
+    show_elites: bool,
+    show_iterations: bool = False,
+    show_configurations: bool = False
+) -> str:
+    """
+    Genera la línea de encabezado del archivo en formato STN.
+
+    Args:
+        show_elites (bool) : Indica si se deben mostrar las configuraciones élites.
+        show_iterations (bool) : Indica si se deben mostrar las iteraciones.
+        show_configurations (bool) : Indica si se deben mostrar las configuraciones.
+
+    Returns:
+        str: Encabezado del archivo STN.
+    """
+    # Lista de encabezados en formato STN
+    stn_header_list = ["Fitness", "Solution"]
+
+    # Se añade la lista de élites si es necesario
+    if show_elites:
+        stn_header_list.append("Elite")
+
+    # Se añade la lista de tipos de iteraciones si es necesario
+    if show_iterations:
+        stn_header_list.append("Iteration")
+
+    # Se añade la lista de configuraciones si es necesario
+    if show_configurations:
+        stn_header_list.append("Data")
+
+    stn_base_header = "Run"
+    for i in range(2):
+        for stn_format in stn_header_list:
+            stn_base_header += f" {stn_format}{i + 1}"
+
+    return stn_base_header
+
+# Función para generar una línea del archivo en formato STN
+def generate_stn_line(
+    run: int,
+    origin_configuration: Configuration,
+    destination_configuration: Configuration,
+    locations_quality_dict: dict[str, list],
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ],
+    significant_digits: int,
+    show_elites: bool,
+    show_iterations: bool = False,
+    show_configurations: bool = False
+) -> str:
+    """
+    Genera la línea en formato STN de una trayectoria (origen, destino).
+
+    Args:
+        run (int): Número de la ejecución (comienza en 1).
+        origin_configuration (Configuration): Configuración de origen con código de locación.
+        destination_configuration (Configuration): Configuración de destino con código de locación.
+        locations_quality_dict (dict): Diccionario { locación: [calidad, estado elite] }.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+        significant_digits (int) : Cantidad de dígitos significativos para la calidad.
+        show_elites (bool) : Indica si se deben mostrar las configuraciones élites.
+        show_iterations (bool) : Indica si se deben mostrar las iteraciones.
+        show_configurations (bool) : Indica si se deben mostrar las configuraciones.
+
+    Returns:
+        str: Línea en formato STN.
+    """
+    # Se obtienen los códigos de locación de origen y destino
+    origin_location_code = origin_configuration.get_location_code()
+    destination_location_code = destination_configuration.get_location_code()
+
+    # Se obtienen las calidades de las locaciones (con la cantidad de dígitos significativos)
+    if significant_digits == 0:
+        quality1 = str(int(locations_quality_dict[origin_location_code][0]))
+        quality2 = str(int(locations_quality_dict[destination_location_code][0]))
+    else:
+        quality1 = f'{locations_quality_dict[origin_location_code][0]:.{significant_digits}f}'
+        quality2 = f'{locations_quality_dict[destination_location_code][0]:.{significant_digits}f}'
+
+    # Listas de origen y destino en formato STN
+    stn_line_origin = [quality1, origin_location_code]
+    stn_line_destination = [quality2, destination_location_code]
+
+    # Se añade la lista de élites si es necesario
+    if show_elites:
+
+        # Se obtienen los estados élites de las configuraciones
+        elite1 = 'T' if locations_quality_dict[origin_location_code][1] == "e" else 'F'
+        elite2 = 'T' if locations_quality_dict[destination_location_code][1] == "e" else 'F'
+
+        stn_line_origin.append(elite1)
+        stn_line_destination.append(elite2)
+
+    # Se añade la lista de tipos de iteraciones si es necesario
+    if show_iterations:
+
+        # Se obtienen los tipos de iteraciones de las configuraciones
+        iteration1 = str(origin_configuration.get_iteration())
+        iteration2 = str(destination_configuration.get_iteration())
+
+        stn_line_origin.append(iteration1)
+        stn_line_destination.append(iteration2)
+
+    # Se añade la lista de configuraciones si es necesario
+    if show_configurations:
+
+        # Se obtiene la información de las configuraciones
+        origin_parameters_str = origin_configuration.to_str(parameters_format, locations_format)
+        destination_parameters_str = destination_configuration.to_str(parameters_format, locations_format)
+
+        stn_line_origin.append(origin_parameters_str)
+        stn_line_destination.append(destination_parameters_str)
+
+    return f'{run} {" ".join(stn_line_origin)} {" ".join(stn_line_destination)}'
+
+# Función para escribir de forma atómica un archivo en formato STN
+def write_stn_file(
+    output_file_path: str,
+    stn_lines: list[str]
+):
+    """
+    Escribe las líneas en formato STN en un archivo temporal y luego lo reemplaza de forma atómica,
+    de modo que un lector nunca observe un archivo a medio escribir.
+
+    Args:
+        output_file_path (str): Ruta del archivo de salida en formato STN.
+        stn_lines (list[str]): Líneas en formato STN (incluyendo el encabezado).
+    """
+    temporary_file_path = f'{output_file_path}.tmp'
+    with open(temporary_file_path, 'w') as file:
+        for line in stn_lines:
+            file.write(line + '\n')
+    os.replace(temporary_file_path, output_file_path)
+
+# Función para leer un archivo de trayectorias agrupando las trayectorias por iteración
+def read_trajectories_file(
+    file_path: str,
+    file_index: int,
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ] | None = None,
+    skipped_lines: list[tuple[str, int, str]] | None = None
+) -> list[list[tuple[Configuration, Configuration]]]:
+    """
+    Lee un archivo de trayectorias de irace y agrupa las trayectorias (origen, destino) por iteración.
+    Las configuraciones de destino de la última iteración se marcan como élites.
+
+    Args:
+        file_path (str): Ruta del archivo de trayectorias.
+        file_index (int): Índice del archivo, usado como número de ejecución de las configuraciones.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo. Si se indica, se genera el código de locación de cada configuración.
+        skipped_lines (list) : Si se indica, las líneas con errores se omiten y se añaden a esta lista como (ruta, línea, mensaje) en lugar de lanzar el error.
+
+    Returns:
+        list: Lista de iteraciones, cada una con la lista de trayectorias (origen, destino).
+    """
+    # Leer contenido del archivo
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+
+    # Lista de locaciones de origen y destino por cada iteración, indicado el código de la locación para un archivo
+    # Ejemplo: [ iteración 1 [ (trayectoria 1), (trayectoria 2) ], iteración 2 [ (...) ], ...]
+    iterations_trajectory_list = []
+
+    # Lista de configuraciones de origen y destino para una iteración
+    # Ejemplo: [ (trayectoria 1), (trayectoria 2) ]
+    trajectory_list = []
+
+    # Contador de iteraciones
+    iteration = 1
+
+    print(f'Inicio del procesamiento del archivo {file_index + 1} ({file_path}) de {len(lines)} lineas...')
+
+    # Se procesa por cada linea del archivo
+    for line_index, line in enumerate(lines):
+
+        # Se omite la primera línea del archivo (encabezado)
+        if (line_index == 0): continue
+
+        try:
+            # Se obtienen las configuraciones de origen y destino
+            origin_configuration, destination_configuration = parse_trajectory_line(line, parameters_format, file_index, file_path, line_index)
+
+            # Se calculan los códigos de locación si es necesario
+            if locations_format is not None:
+                origin_configuration.generate_location_code(parameters_format, locations_format)
+                destination_configuration.generate_location_code(parameters_format, locations_format)
+        except (ValueError, IndexError) as e:
+            if skipped_lines is None:
+                raise
+            skipped_lines.append((file_path, line_index, str(e)))
+            continue
+
+        # Se actualiza la iteración si es necesario, actualizando la lista de trayectorias
+        if origin_configuration.get_iteration() > iteration:
+            iteration += 1
+            iterations_trajectory_list.append(trajectory_list)
+            trajectory_list = []
+
+        # Se añade la trayectoria a la lista
+        trajectory_list.append((origin_configuration, destination_configuration))
+
+    # Se identifica como élites las configuraciones de destino de la última iteración
+    for _, destination_configuration in trajectory_list:
+        destination_configuration.set_elite_state('e')
+
+    # Se añade la lista de trayectorias de la última iteración
+    iterations_trajectory_list.append(trajectory_list)
+
+    return iterations_trajectory_list
+
 # Función para convertir las trayectorias en formato STN con vecindades
 def trajectories_to_stn_format(
     folder_path: str,
@@ -35,7 +378,12 @@ def trajectories_to_stn_format(
     significant_digits: int,
     show_elites: bool,
     show_iterations: bool = False,
-    show_configurations: bool = False
+    show_configurations: bool = False,
+    locations_index: Locations_Index | None = None,
+    database_path: str | None = None,
+    error_policy: str = 'abort',
+    checkpoint_path: str | None = None,
+    report_file_path: str | None = None
 ) -> list[str]:
     """
     Convierte los archivos de trayectorias de irace en formato STN con vecindades.
@@ -51,25 +399,19 @@ def trajectories_to_stn_format(
         show_elites (bool) : Indica si se deben mostrar las configuraciones élites en el archivo STN.
         show_iterations (bool) : Indica si se deben mostrar los tipos de iteraciones en el archivo STN (inicio, centro, fin).
         show_configurations (bool) : Indica si se deben mostrar las configuraciones en el archivo STN.
+        locations_index (Locations_Index) : Índice espacial (vacío) que se completa con las locaciones generadas, para consultas de vecindad y agrupamiento posteriores.
+        database_path (str) : Ruta de una base de datos SQLite donde se exportan las configuraciones, transiciones y acumulados de locaciones (los archivos ya exportados que no cambiaron se omiten). La exportación se realiza después de escribir el archivo STN y sus errores solo se informan.
+        error_policy (str) : Política ante errores en un archivo: 'abort' para detener la conversión, 'skip_file' para omitir el archivo completo o 'skip_line' para omitir solo las líneas con errores.
+        checkpoint_path (str) : Carpeta donde se guarda un checkpoint de cada archivo procesado, para reanudar la conversión sin reprocesar los archivos que no cambiaron.
+        report_file_path (str) : Ruta de un archivo donde se escribe el reporte de archivos y líneas omitidos (se reescribe en cada conversión, aunque no haya omisiones o la conversión se detenga).
     Returns:
         List[str]: Lista de representaciones en formato STN para cada archivo.
     """
     try:
-        # Validación de tamaños de listas
-        if len(parameters_format) == 0:
-            raise ValueError("La lista de formatos de parámetros no puede estar vacía.")
-        elif len(locations_format) == 0:
-            raise ValueError("La lista de formatos de locaciones no puede estar vacía.")
-        elif len(parameters_format) != len(locations_format):
-            raise ValueError("La cantidad de formatos de parámetros y locaciones debe ser la misma.")
-
-        # Validación de los formatos de los otros parámetros
-        if quality_type not in ['mean', 'min', 'max']:
-            raise ValueError(f"El tipo de calidad '{quality_type}' no es válido.")
-        elif significant_digits < 0:
-            raise ValueError("La cantidad de dígitos significativos no puede ser negativa.")
-        elif not isinstance(show_elites, bool):
-            raise ValueError("El valor de mostrar élites debe ser un valor booleano.")
+        # Validación de los formatos y opciones
+        validate_stn_arguments(parameters_format, locations_format, quality_type, significant_digits, show_elites)
+        if error_policy not in ['abort', 'skip_file', 'skip_line']:
+            raise ValueError(f"La política de errores '{error_policy}' no es válida.")
 
         # Leer los archivos desde la carpeta usando la función anterior
         file_paths = read_trajectories_files_folder(folder_path, file_extension)
@@ -78,105 +420,79 @@ def trajectories_to_stn_format(
         # Ejemplo: [archivo 1 [ iteración 1 [ (trayectoria 1), (trayectoria 2) ], iteración 2 [ (...) ], ...], archivo 2 [ (...), ...], ...]
         files_iterations_trajectory_list = []
 
-        # Recorre todos los archivos encontrados
-        for file_index, file_path in enumerate(file_paths):
-
-            # Leer contenido del archivo
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-
-            # Lista de locaciones de origen y destino por cada iteración, indicado el código de la locación para un archivo
-            # Ejemplo: [ iteración 1 [ (trayectoria 1), (trayectoria 2) ], iteración 2 [ (...) ], ...]
-            iterations_trajectory_list = []
+        # Rutas de los archivos procesados y su tamaño y fecha de modificación antes de leerlos (en el mismo orden que la lista anterior)
+        processed_file_paths = []
+        processed_file_stats = []
 
-            # Lista de configuraciones de origen y destino para una iteración
-            # Ejemplo: [ (trayectoria 1), (trayectoria 2) ]
-            trajectory_list = []
-
-            # Contador de iteraciones
-            iteration = 1
-
-            print(f'Inicio del procesamiento del archivo {file_index + 1} ({file_path}) de {len(lines)} lineas...')
+        # Reporte de archivos y líneas omitidos
+        # Ejemplo: [ (ruta, mensaje), ... ] y [ (ruta, línea, mensaje), ... ]
+        skipped_files = []
+        skipped_lines = []
 
-            start_time = time.time()
-
-            # Se procesa por cada linea del archivo
-            for line_index, line in enumerate(lines):
-
-                # Se omite la primera línea del archivo (encabezado)
-                if (line_index == 0): continue
-
-                # Se obtienen ambos bloques de configuraciones (origen y destino) y se almacenan en una lista como strings
-                trajectory_blocks = line.split('|')
-                if len(trajectory_blocks) != 2:
-                    raise ValueError(f"El archivo '{file_path}' no contiene dos bloques de trayectorias en la línea {line_index}.")
-
-                # Datos de la configuración de origen
-                origin_configuration = trajectory_blocks[0].split()
-                origin_length = len(origin_configuration)
-                if origin_length != 4 + len(parameters_format):
-                    raise ValueError(f"El archivo '{file_path}' no contiene la cantidad correcta de parámetros en la línea {line_index}.")
-
-                # Se obtiene la información de la configuración de origen
-                origin_id = int(origin_configuration[0])
-                origin_parameters_pre_cast = origin_configuration[1:origin_length - 3]
-                origin_parameters = []
-                for k, origin_parameter_value in enumerate(origin_parameters_pre_cast):
-                    origin_parameter_format = parameters_format[k]
-                    origin_parameter_name = origin_parameter_format.get_name()
-                    origin_parameter = Parameter(origin_parameter_name, origin_parameter_value)
-                    origin_parameter.set_value(origin_parameter_format.cast_parameter_value(origin_parameter))
-                    origin_parameters.append(origin_parameter)
-                origin_elite_state = origin_configuration[origin_length - 3]
-                origin_new_iteration = int(origin_configuration[origin_length - 2])
-                origin_quality = float(origin_configuration[origin_length - 1])
-
-                # Se actualiza la iteración si es necesario, actualizando la lista de trayectorias
-                if origin_new_iteration > iteration:
-                    iteration += 1
-                    iterations_trajectory_list.append(trajectory_list)
-                    trajectory_list = []
-
-                # Se crea la configuración de origen
-                origin_configuration = Configuration(id=origin_id, run=file_index, iteration=origin_new_iteration, parameters=origin_parameters, elite_state=origin_elite_state, quality=origin_quality, location_code='')
-                
-                # Datos de la configuración de destino
-                destination_configuration = trajectory_blocks[1].split()
-                destination_length = len(destination_configuration)
-                if destination_length != 4 + len(parameters_format):
-                    raise ValueError(f"El archivo '{file_path}' no contiene la cantidad correcta de parámetros en la línea {line_index}.")
-
-                # Se obtiene la información de la configuración de destino
-                destination_id = int(destination_configuration[0])
-                destination_parameters_pre_cast = destination_configuration[1:destination_length - 3]
-                destination_parameters = []
-                for k, destination_parameter_value in enumerate(destination_parameters_pre_cast):
-                    destination_parameter_format = parameters_format[k]
-                    destination_parameter_name = destination_parameter_format.get_name()
-                    destination_parameter = Parameter(destination_parameter_name, destination_parameter_value)
-                    destination_parameter.set_value(destination_parameter_format.cast_parameter_value(destination_parameter))
-                    destination_parameters.append(destination_parameter)
-                destination_elite_state = destination_configuration[destination_length - 3]
-                destination_new_iteration = int(destination_configuration[destination_length - 2])
-                destination_quality = float(destination_configuration[destination_length - 1])
-
-                # Se crea la configuración de destino
-                destination_configuration = Configuration(id=destination_id, run=file_index, iteration=destination_new_iteration, parameters=destination_parameters, elite_state=destination_elite_state, quality=destination_quality, location_code='')
-
-                # Se añade la trayectoria a la lista
-                trajectory_list.append((origin_configuration, destination_configuration))
-
-            # Se identifica como élites las configuraciones de destino de la última iteración
-            for _, destination_configuration in trajectory_list:
-                destination_configuration.set_elite_state('e')
-
-            # Se añade la lista de trayectorias de la última iteración
-            iterations_trajectory_list.append(trajectory_list)
+        formats_signature = get_formats_signature(parameters_format, locations_format)
+        if checkpoint_path is not None:
+            os.makedirs(checkpoint_path, exist_ok=True)
 
-            iteration += 1
+        start_time = time.time()
 
-            # Se añade la lista de trayectorias por archivo
-            files_iterations_trajectory_list.append(iterations_trajectory_list)
+        try:
+            # Recorre todos los archivos encontrados
+            for file_path in file_paths:
+
+                # Número de ejecución según los archivos procesados correctamente
+                file_index = len(files_iterations_trajectory_list)
+
+                # El tamaño y la fecha se obtienen antes de leer, para que un archivo que crece se vuelva a procesar
+                file_stat = os.stat(file_path)
+
+                # Se intenta reanudar desde el checkpoint del archivo
+                checkpoint = None
+                if checkpoint_path is not None:
+                    checkpoint = load_trajectories_checkpoint(checkpoint_path, file_path, file_index, formats_signature)
+
+                    # Un checkpoint con líneas omitidas solo es válido si se siguen omitiendo líneas
+                    if checkpoint is not None and checkpoint[1] and error_policy != 'skip_line':
+                        checkpoint = None
+
+                if checkpoint is not None:
+                    print(f'Se reanuda el archivo {file_index + 1} ({file_path}) desde su checkpoint.')
+                    iterations_trajectory_list, file_skipped_lines = checkpoint
+                else:
+                    file_skipped_lines = [] if error_policy == 'skip_line' else None
+                    try:
+                        iterations_trajectory_list = read_trajectories_file(file_path, file_index, parameters_format, locations_format, file_skipped_lines)
+                    except Exception as e:
+                        if error_policy != 'skip_file':
+                            raise
+                        print(f'Se omite el archivo {file_path}: {e}')
+                        skipped_files.append((file_path, str(e)))
+                        continue
+
+                    # Se guarda el checkpoint del archivo procesado
+                    if checkpoint_path is not None:
+                        save_trajectories_checkpoint(checkpoint_path, file_path, formats_signature, iterations_trajectory_list, file_skipped_lines or [], file_stat)
+
+                skipped_lines.extend(file_skipped_lines or [])
+
+                # Se añade la lista de trayectorias por archivo
+                files_iterations_trajectory_list.append(iterations_trajectory_list)
+                processed_file_paths.append(file_path)
+                processed_file_stats.append(file_stat)
+        finally:
+            # Reporte de archivos y líneas omitidos, que se escribe siempre (también sin omisiones o si la conversión
+            # se detiene) para no dejar el reporte de una ejecución anterior
+            report_lines = [f'Archivos omitidos: {len(skipped_files)} - Líneas omitidas: {len(skipped_lines)}']
+            report_lines += [f'{file_path}: {message}' for file_path, message in skipped_files]
+            report_lines += [f'{file_path}:{line_index}: {message}' for file_path, line_index, message in skipped_lines]
+            if skipped_files or skipped_lines:
+                for report_line in report_lines[:21]:
+                    print(report_line)
+                if len(report_lines) > 21:
+                    print(f'... ({len(report_lines) - 21} más)')
+            if report_file_path is not None:
+                with open(report_file_path, 'w') as file:
+                    for report_line in report_lines:
+                        file.write(report_line + '\n')
 
         end_time = time.time()
 
@@ -188,32 +504,27 @@ def trajectories_to_stn_format(
 
         start_time = time.time()
 
-        # Diccionario global de locaciones con las configuraciones que pertenecen a cada una de estas
-        # Ejemplo: { locación: [ Configuración, ... ], ... }
-        locations_dict = {}
+        # Diccionario global de locaciones con el acumulado de las configuraciones que pertenecen a cada una de estas
+        # Ejemplo: { locación: Location_Aggregate, ... }
+        locations_aggregates = {}
 
-        # Se recorre la lista de configuraciones por archivo y se generan los códigos de locaciones
+        # Se recorre la lista de configuraciones por archivo, cuyos códigos de locación se calcularon al leer cada archivo
         for iterations_trajectory_list in files_iterations_trajectory_list:
             for trajectory_list in iterations_trajectory_list:
-                for origin_configuration, destination_configuration in trajectory_list:
+                for trajectory in trajectory_list:
+                    for configuration in trajectory:
 
-                    # Se calcula el código de locación de origen
-                    origin_location_code = origin_configuration.generate_location_code(parameters_format, locations_format)
+                        # Se obtiene el código de locación de la configuración
+                        location_code = configuration.get_location_code()
 
-                    # Se añade la configuración de origen al diccionario de locaciones
-                    if origin_location_code not in locations_dict:
-                        locations_dict[origin_location_code] = [origin_configuration]
-                    else:
-                        locations_dict[origin_location_code].append(origin_configuration)
+                        # Se añade la configuración al acumulado de su locación
+                        if location_code not in locations_aggregates:
+                            locations_aggregates[location_code] = Location_Aggregate(location_code)
 
-                    # Se calcula el código de locación de destino
-                    destination_location_code = destination_configuration.generate_location_code(parameters_format, locations_format)
-
-                    # Se añade la configuración de destino al diccionario de locaciones
-                    if destination_location_code not in locations_dict:
-                        locations_dict[destination_location_code] = [destination_configuration]
-                    else:
-                        locations_dict[destination_location_code].append(destination_configuration)
+                            # Se añade la locación al índice espacial si es necesario
+                            if locations_index is not None:
+                                locations_index.add_location(location_code, configuration.generate_location_bins(parameters_format, locations_format), locations_aggregates[location_code])
+                        locations_aggregates[location_code].add_configuration(configuration)
 
         end_time = time.time()
 
@@ -227,25 +538,7 @@ def trajectories_to_stn_format(
 
         # Diccionario de las calidades y estado de élite de las locaciones calculadas
         # Ejemplo: { locación: [calidad, estado elite], ... }
-        locations_quality_dict = {}
-
-        # Se calcula la calidad de las locaciones
-        for location_code, configurations in locations_dict.items():
-
-            # Se calcula la calidad de la locación según el tipo de calidad
-            if quality_type == 'min': # Se toma el minimo de las calidades de las configuraciones en la locación
-                quality = min([configuration.get_quality() for configuration in configurations])
-            elif quality_type == 'max': # Se toma el máximo de las calidades de las configuraciones en la locación
-                quality = max([configuration.get_quality() for configuration in configurations])
-            elif quality_type == 'mean': # Se toma la media de las calidades de las configuraciones en la locación
-                quality = sum([configuration.get_quality() for configuration in configurations]) / len(configurations)
-            else:
-                raise ValueError(f"El tipo de calidad '{quality_type}' no es válido.")
-
-            # Se revisa si alguna de las configuraciones es élite
-            elite = 'e' if any([configuration.get_elite_state() == 'e' for configuration in configurations]) else 'ne'
-
-            locations_quality_dict[location_code] = [quality, elite]
+        locations_quality_dict = calculate_locations_quality(locations_aggregates, quality_type)
 
         end_time = time.time()
         
@@ -257,100 +550,124 @@ def trajectories_to_stn_format(
         
         start_time = time.time()
 
-        # Lista de encabezados en formato STN
-        stn_header_list = ["Fitness", "Solution"]
-        
-        # Se añade la lista de élites si es necesario
-        if show_elites:
-            stn_header_list.append("Elite")
-            
-        # Se añade la lista de tipos de iteraciones si es necesario
-        if show_iterations:
-            stn_header_list.append("Iteration")
-        
-        # Se añade la lista de configuraciones si es necesario
-        if show_configurations:
-            stn_header_list.append("Data")
-        
-        stn_base_header = "Run"
-        for i in range(2):
-            for stn_format in stn_header_list:
-                stn_base_header += f" {stn_format}{i + 1}"
-        
         # Lista de archivos en formato STN
-        stn_format_files = [stn_base_header]
+        stn_format_files = [generate_stn_header(show_elites, show_iterations, show_configurations)]
 
         # Se realiza la creación de la lista en formato STN
         for file_index, iterations_trajectory_list in enumerate(files_iterations_trajectory_list):
             for trajectory_list in iterations_trajectory_list:
                 for origin_configuration, destination_configuration in trajectory_list:
 
-                    # Se obtiene el índice de la run
-                    run = str(file_index + 1)
+                    # Se añade la línea al archivo en formato STN
+                    stn_format_files.append(generate_stn_line(
+                        file_index + 1, origin_configuration, destination_configuration, locations_quality_dict,
+                        parameters_format, locations_format, significant_digits,
+                        show_elites, show_iterations, show_configurations
+                    ))
+
+        end_time = time.time()
+
+        print(f'Fin del proceso de generación del archivo en formato STN. Tiempo total: {end_time - start_time} segundos.')
+
+        # --------------------------------------------------------------------------------------------------
 
-                    # Se obtienen los códigos de locación de origen y destino
-                    origin_location_code = origin_configuration.get_location_code()
-                    destination_location_code = destination_configuration.get_location_code()
+        # Escritura del archivo con el nombre indicado
+        write_stn_file(output_file_path, stn_format_files)
 
-                    # Se obtienen las calidades de las locaciones (con la cantidad de dígitos significativos)
-                    if significant_digits == 0:
-                        quality1 = str(int(locations_quality_dict[origin_location_code][0]))
-                        quality2 = str(int(locations_quality_dict[destination_location_code][0]))
-                    else:
-                        quality1 = f'{locations_quality_dict[origin_location_code][0]:.{significant_digits}f}'
-                        quality2 = f'{locations_quality_dict[destination_location_code][0]:.{significant_digits}f}'
+        # --------------------------------------------------------------------------------------------------
 
-                    # Listas de origen y destino en formato STN
-                    stn_line_origin = [quality1, origin_location_code]
-                    stn_line_destination = [quality2, destination_location_code]
+        # Exportación a la base de datos si es necesario, después de escribir el archivo STN para que un error
+        # en la base de datos no descarte la conversión
+        if database_path is not None:
 
-                    # Se añade la lista de élites si es necesario
-                    if show_elites:
+            print('Inicio del proceso de exportación a la base de datos...')
 
-                        # Se obtienen los estados élites de las configuraciones
-                        elite1 = 'T' if locations_quality_dict[origin_location_code][1] == "e" else 'F'
-                        elite2 = 'T' if locations_quality_dict[destination_location_code][1] == "e" else 'F'
+            start_time = time.time()
 
-                        stn_line_origin.append(elite1)
-                        stn_line_destination.append(elite2)
-                    
-                    # Se añade la lista de tipos de iteraciones si es necesario
-                    if show_iterations:
+            try:
+                connection = open_trajectories_database(database_path, parameters_format, locations_format)
+                try:
+                    for file_path, file_stat, iterations_trajectory_list in zip(processed_file_paths, processed_file_stats, files_iterations_trajectory_list):
+                        if is_trajectories_file_inserted(connection, os.path.abspath(file_path), file_stat):
+                            print(f'El archivo {file_path} ya está en la base de datos, se omite.')
+                            continue
+                        insert_trajectories_file(connection, os.path.abspath(file_path), iterations_trajectory_list, file_stat)
+                finally:
+                    connection.close()
+            except Exception as e:
+                print(f'Error en la exportación a la base de datos (el archivo STN sí se escribió): {e}')
 
-                        # Se obtienen los tipos de iteraciones de las configuraciones
-                        iteration1 = str(origin_configuration.get_iteration())
-                        iteration2 = str(destination_configuration.get_iteration())
+            end_time = time.time()
 
-                        stn_line_origin.append(iteration1)
-                        stn_line_destination.append(iteration2)
+            print(f'Fin del proceso de exportación a la base de datos. Tiempo total: {end_time - start_time} segundos.')
+
+        return stn_format_files
+    except Exception as e:
+        print(f'Error en la conversión de las trayectorias a formato STN: {e}')
+        return []
+    finally:
+        print('Fin del proceso de conversión de las trayectorias a formato STN.')
+
+# Función para exportar las trayectorias a una base de datos SQLite de forma incremental
+def trajectories_to_database(
+    folder_path: str,
+    file_extension: str,
+    database_path: str,
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ]
+) -> list[str]:
+    """
+    Exporta los archivos de trayectorias de irace a una base de datos SQLite con las configuraciones (parámetros,
+    calidades y estados élite por iteración), las transiciones y los acumulados de las locaciones. Cada archivo
+    se inserta en su propia transacción y los archivos que ya están en la base de datos no se vuelven a leer,
+    salvo que hayan cambiado (tamaño o fecha de modificación), en cuyo caso se reemplaza su ejecución.
+
+    Args:
+        folder_path (str): Ruta de la carpeta con los archivos de trayectorias de irace.
+        file_extension (str): Extensión de archivo a buscar (por ejemplo, ".txt").
+        database_path (str): Ruta del archivo de la base de datos.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+    Returns:
+        List[str]: Lista de rutas de los archivos insertados en esta llamada.
+    """
+    try:
+        # Validación de tamaños de listas
+        if len(parameters_format) == 0:
+            raise ValueError("La lista de formatos de parámetros no puede estar vacía.")
+        elif len(parameters_format) != len(locations_format):
+            raise ValueError("La cantidad de formatos de parámetros y locaciones debe ser la misma.")
 
-                    # Se añade la lista de configuraciones si es necesario
-                    if show_configurations:
+        # Leer los archivos desde la carpeta
+        file_paths = read_trajectories_files_folder(folder_path, file_extension)
 
-                        # Se obtiene la información de las configuraciones
-                        origin_parameters_str = origin_configuration.to_str(parameters_format, locations_format)
-                        destination_parameters_str = destination_configuration.to_str(parameters_format, locations_format)
+        # Lista de archivos insertados
+        inserted_file_paths = []
 
-                        stn_line_origin.append(origin_parameters_str)
-                        stn_line_destination.append(destination_parameters_str)
+        start_time = time.time()
 
-                    # Se añade la línea al archivo en formato STN con o sin élites
-                    stn_format_files.append(f'{run} {" ".join(stn_line_origin)} {" ".join(stn_line_destination)}')
+        connection = open_trajectories_database(database_path, parameters_format, locations_format)
+        try:
+            for file_index, file_path in enumerate(file_paths):
 
-        end_time = time.time()
+                # El tamaño y la fecha se obtienen antes de leer, para que un archivo que crece se vuelva a insertar
+                file_stat = os.stat(file_path)
 
-        print(f'Fin del proceso de generación del archivo en formato STN. Tiempo total: {end_time - start_time} segundos.')
+                # Se omiten los archivos ya insertados que no cambiaron
+                if is_trajectories_file_inserted(connection, os.path.abspath(file_path), file_stat):
+                    print(f'El archivo {file_path} ya está en la base de datos, se omite.')
+                    continue
+                iterations_trajectory_list = read_trajectories_file(file_path, file_index, parameters_format, locations_format)
+                insert_trajectories_file(connection, os.path.abspath(file_path), iterations_trajectory_list, file_stat)
+                inserted_file_paths.append(file_path)
+        finally:
+            connection.close()
 
-        # --------------------------------------------------------------------------------------------------
+        end_time = time.time()
 
-        # Escritura del archivo con el nombre indicado
-        with open(output_file_path, 'w') as file:
-            for line in stn_format_files:
-                file.write(line + '\n')
+        print(f'Fin de la exportación de {len(inserted_file_paths)} archivos a la base de datos. Tiempo total: {end_time - start_time} segundos.')
 
-        return stn_format_files
+        return inserted_file_paths
     except Exception as e:
-        print(f'Error en la conversión de las trayectorias a formato STN: {e}')
+        print(f'Error en la exportación de las trayectorias a la base de datos: {e}')
         return []
-    finally:
-        print('Fin del proceso de conversión de las trayectorias a formato STN.')
@@ -0,0 +1,440 @@
+import os, time
+from typing import Callable
+from .Trajectories_Classes import Parameter_Format, Location_Format, Configuration, Location_Aggregate
+from .Trajectories_Interpreter import (
+    validate_stn_arguments,
+    parse_trajectory_line,
+    generate_stn_header,
+    generate_stn_line,
+    write_stn_file,
+)
+
+class Trajectories_Follower:
+    """
+    Clase para seguir (modo tail) los archivos de trayectorias de una carpeta mientras irace sigue ejecutándose.
+
+    Cada llamada a poll() solo lee los bytes añadidos desde la llamada anterior y update_stn_lines() solo
+    recalcula las locaciones modificadas desde la actualización anterior, volviendo a generar únicamente las
+    líneas STN que pasan por ellas. El costo de una actualización es proporcional a las líneas nuevas (y a las
+    trayectorias de las locaciones que cambiaron), no al tamaño de los archivos.
+
+    Las configuraciones de destino de la iteración en curso de cada ejecución se consideran élites al generar
+    las líneas STN (como si el archivo terminara en ese momento), sin modificar los acumulados, por lo que el
+    estado élite se corrige solo cuando comienza una nueva iteración. Una ejecución solo se da por terminada con
+    una señal explícita: un archivo centinela (ruta del archivo + completion_suffix) o complete_runs().
+
+    Las líneas con errores se omiten y se registran en skipped_lines, y los archivos que no se pueden seguir
+    (por ejemplo, truncados o eliminados) se dejan de seguir y se registran en skipped_files.
+
+    Attributes:
+        folder_path: Ruta de la carpeta con los archivos de trayectorias
+        file_extension: Extensión de archivo a buscar
+        parameters_format: Formato de los parámetros del algoritmo
+        locations_format: Formato de las locaciones del algoritmo
+        quality_type: Tipo de calidad a considerar para las locaciones (mean|min|max)
+        completion_suffix: Sufijo del archivo centinela que indica que una ejecución terminó
+        significant_digits: Cantidad de dígitos significativos para la calidad
+        show_elites: Indica si se deben mostrar las configuraciones élites
+        show_iterations: Indica si se deben mostrar las iteraciones
+        show_configurations: Indica si se deben mostrar las configuraciones
+    """
+    # Constructor de la clase
+    def __init__(self, folder_path: str, file_extension: str, parameters_format: list[Parameter_Format], locations_format: list[Location_Format], quality_type: str, completion_suffix: str = '.done',
+                 significant_digits: int = 2, show_elites: bool = True, show_iterations: bool = False, show_configurations: bool = False):
+        # Validación de la carpeta
+        if not os.path.isdir(folder_path):
+            raise ValueError(f"La carpeta especificada '{folder_path}' no existe o no es válida.")
+
+        self.folder_path = folder_path
+        self.file_extension = file_extension
+        self.parameters_format = parameters_format
+        self.locations_format = locations_format
+        self.quality_type = quality_type
+        self.completion_suffix = completion_suffix
+        self.significant_digits = significant_digits
+        self.show_elites = show_elites
+        self.show_iterations = show_iterations
+        self.show_configurations = show_configurations
+
+        # Estado de lectura de cada archivo
+        # Ejemplo: { ruta: { 'run': 0, 'offset': 0, 'buffer': b'', ... }, ... }
+        self.files_state = {}
+
+        # Diccionario global de locaciones con el acumulado de sus configuraciones
+        # Ejemplo: { locación: Location_Aggregate, ... }
+        self.locations_aggregates = {}
+
+        # Lista de trayectorias en orden de llegada
+        # Ejemplo: [ (run, configuración de origen, configuración de destino), ... ]
+        self.trajectories = []
+
+        # Índices de las trayectorias que pasan por cada locación
+        # Ejemplo: { locación: [índice, ...], ... }
+        self.locations_trajectories = {}
+
+        # Cantidad de destinos de la iteración en curso (de todas las ejecuciones) en cada locación
+        # Ejemplo: { locación: cantidad, ... }
+        self.current_destinations_count = {}
+
+        # Calidad y estado élite mostrados de cada locación, y locaciones modificadas desde la última actualización
+        # Ejemplo: { locación: [calidad, estado elite], ... }
+        self.locations_quality_dict = {}
+        self.modified_locations = set()
+
+        # Locaciones cuyo valor cambió pero cuyas líneas anteriores aún no se vuelven a generar
+        self.stale_locations = set()
+
+        # Líneas en formato STN generadas (sin encabezado), alineadas con la lista de trayectorias
+        self.stn_lines = []
+
+        # Reporte de archivos y líneas omitidos
+        # Ejemplo: [ (ruta, mensaje), ... ] y [ (ruta, línea, mensaje), ... ]
+        self.skipped_files = []
+        self.skipped_lines = []
+
+    # Método para obtener la cantidad de trayectorias leídas
+    def get_trajectories_count(self) -> int:
+        return len(self.trajectories)
+
+    # Método para obtener los acumulados de las locaciones
+    def get_locations_aggregates(self) -> dict[str, Location_Aggregate]:
+        return self.locations_aggregates
+
+    # Método para obtener las líneas en formato STN generadas hasta la última actualización (sin encabezado)
+    def get_stn_lines(self) -> list[str]:
+        return self.stn_lines
+
+    # Método para obtener los archivos omitidos
+    def get_skipped_files(self) -> list[tuple[str, str]]:
+        return self.skipped_files
+
+    # Método para obtener las líneas omitidas
+    def get_skipped_lines(self) -> list[tuple[str, int, str]]:
+        return self.skipped_lines
+
+    # Método para saber si todas las ejecuciones detectadas han terminado
+    def is_complete(self) -> bool:
+        return len(self.files_state) > 0 and all(state['completed'] for state in self.files_state.values())
+
+    # Método para añadir una configuración al acumulado de su locación
+    def _add_configuration(self, configuration: Configuration, trajectory_index: int):
+        location_code = configuration.get_location_code()
+        if location_code not in self.locations_aggregates:
+            self.locations_aggregates[location_code] = Location_Aggregate(location_code)
+            self.locations_trajectories[location_code] = []
+        self.locations_aggregates[location_code].add_configuration(configuration)
+
+        trajectories_indexes = self.locations_trajectories[location_code]
+        if not trajectories_indexes or trajectories_indexes[-1] != trajectory_index:
+            trajectories_indexes.append(trajectory_index)
+        self.modified_locations.add(location_code)
+
+    # Método para actualizar la cantidad de destinos de la iteración en curso de una locación
+    def _update_current_destination(self, location_code: str, difference: int):
+        count = self.current_destinations_count.get(location_code, 0) + difference
+        if count > 0:
+            self.current_destinations_count[location_code] = count
+        else:
+            self.current_destinations_count.pop(location_code, None)
+        self.modified_locations.add(location_code)
+
+    # Método para procesar una línea completa de un archivo
+    def _process_line(self, file_path: str, state: dict, line: str):
+        state['line_index'] += 1
+
+        # Se omite la primera línea del archivo (encabezado) y las líneas vacías
+        if state['line_index'] == 0 or not line.strip():
+            return
+
+        # Se obtienen y localizan las configuraciones antes de modificar el estado, para omitir la línea si falla
+        try:
+            origin_configuration, destination_configuration = parse_trajectory_line(line, self.parameters_format, state['run'], file_path, state['line_index'])
+            origin_configuration.generate_location_code(self.parameters_format, self.locations_format)
+            destination_configuration.generate_location_code(self.parameters_format, self.locations_format)
+        except (ValueError, IndexError) as e:
+            print(f'Se omite la línea {state["line_index"]} del archivo {file_path}: {e}')
+            self.skipped_lines.append((file_path, state['line_index'], str(e)))
+            return
+
+        # Se actualiza la iteración si es necesario, descartando los destinos de la iteración anterior
+        if origin_configuration.get_iteration() > state['iteration']:
+            state['iteration'] += 1
+            for previous_destination in state['last_destinations']:
+                self._update_current_destination(previous_destination.get_location_code(), -1)
+            state['last_destinations'] = []
+
+        trajectory_index = len(self.trajectories)
+        self._add_configuration(origin_configuration, trajectory_index)
+        self._add_configuration(destination_configuration, trajectory_index)
+
+        state['last_destinations'].append(destination_configuration)
+        self._update_current_destination(destination_configuration.get_location_code(), 1)
+        self.trajectories.append((state['run'] + 1, origin_configuration, destination_configuration))
+
+    # Método para dejar de seguir un archivo que no se puede leer
+    def _skip_file(self, file_path: str, state: dict, message: str):
+        print(f'Se deja de seguir el archivo {file_path}: {message}')
+        self.skipped_files.append((file_path, message))
+        state['completed'] = True
+        state['failed'] = True
+
+    # Método para leer las líneas nuevas de todos los archivos de la carpeta
+    def poll(self) -> int:
+        """
+        Lee las líneas añadidas a los archivos de la carpeta desde la última llamada y actualiza los acumulados.
+        Los archivos nuevos se numeran como ejecuciones en el orden en que se detectan.
+
+        Returns:
+            int: Cantidad de trayectorias nuevas leídas.
+        """
+        previous_count = len(self.trajectories)
+
+        # Se detectan los archivos nuevos
+        for file in sorted(os.listdir(self.folder_path)):
+            file_path = os.path.join(self.folder_path, file)
+            if file.endswith(self.file_extension) and not file.endswith(self.completion_suffix) and file_path not in self.files_state:
+                self.files_state[file_path] = {
+                    'run': len(self.files_state),
+                    'offset': 0,
+                    'buffer': b'',
+                    'line_index': -1,
+                    'iteration': 1,
+                    'last_destinations': [],
+                    'completed': False,
+                    'failed': False,
+                }
+
+        # Se leen solo los bytes nuevos de cada archivo
+        for file_path, state in self.files_state.items():
+            if state['failed']:
+                continue
+
+            try:
+                file_stat = os.stat(file_path)
+                if file_stat.st_size < state['offset']:
+                    raise ValueError("el archivo fue truncado mientras se seguía")
+                if file_stat.st_size == state['offset']:
+                    continue
+
+                with open(file_path, 'rb') as file:
+                    file.seek(state['offset'])
+                    data = file.read(file_stat.st_size - state['offset'])
+            except (OSError, ValueError) as e:
+                self._skip_file(file_path, state, str(e))
+                continue
+            state['offset'] += len(data)
+
+            if state['completed']:
+                print(f'Advertencia: el archivo {file_path} recibió nuevas líneas después de considerarse terminado.')
+
+            # Solo se procesan las líneas completas, el resto queda en el buffer
+            lines = (state['buffer'] + data).split(b'\n')
+            state['buffer'] = lines.pop()
+            for line in lines:
+                self._process_line(file_path, state, line.decode(errors='replace'))
+
+        return len(self.trajectories) - previous_count
+
+    # Método para marcar como terminada una ejecución
+    def _complete_run(self, file_path: str, state: dict):
+
+        # Se procesa la última línea si el archivo no termina con un salto de línea
+        if state['buffer'].strip():
+            self._process_line(file_path, state, state['buffer'].decode(errors='replace'))
+        state['buffer'] = b''
+        state['completed'] = True
+
+    # Método para marcar como terminadas las ejecuciones con una señal explícita
+    def complete_runs(self, file_paths: list[str] | None = None) -> int:
+        """
+        Marca como terminadas las ejecuciones indicadas (o todas si file_paths es None), además de las que tienen
+        su archivo centinela (ruta del archivo + completion_suffix). Conviene llamar a poll() antes, para que la
+        última parte de cada archivo ya esté leída.
+
+        Args:
+            file_paths (list[str]): Rutas de los archivos de las ejecuciones terminadas (None para todas).
+
+        Returns:
+            int: Cantidad de ejecuciones marcadas como terminadas en esta llamada.
+        """
+        completed_runs = 0
+        for file_path, state in self.files_state.items():
+            if state['completed']:
+                continue
+            signalled = file_paths is None or file_path in file_paths or os.path.exists(f'{file_path}{self.completion_suffix}')
+            if not signalled:
+                continue
+            self._complete_run(file_path, state)
+            completed_runs += 1
+
+        return completed_runs
+
+    # Método para generar la línea en formato STN de una trayectoria
+    def _generate_stn_line(self, trajectory_index: int) -> str:
+        run, origin_configuration, destination_configuration = self.trajectories[trajectory_index]
+        return generate_stn_line(
+            run, origin_configuration, destination_configuration, self.locations_quality_dict,
+            self.parameters_format, self.locations_format, self.significant_digits,
+            self.show_elites, self.show_iterations, self.show_configurations
+        )
+
+    # Método para actualizar las líneas en formato STN con las trayectorias y locaciones modificadas
+    def update_stn_lines(self, refresh_previous: bool = True) -> list[str]:
+        """
+        Recalcula la calidad y el estado élite solo de las locaciones modificadas desde la última actualización y
+        genera las líneas de las trayectorias nuevas. Si refresh_previous es verdadero, también vuelve a generar las
+        líneas anteriores que pasan por locaciones cuyo valor cambió; si es falso (modo delta), esas locaciones se
+        acumulan y se refrescan en la siguiente actualización con refresh_previous verdadero.
+
+        Returns:
+            list[str]: Líneas en formato STN de las trayectorias nuevas.
+        """
+        # Se recalculan solo las locaciones modificadas
+        for location_code in self.modified_locations:
+            location_aggregate = self.locations_aggregates[location_code]
+            elite = 'e' if location_aggregate.get_elite_state() == 'e' or location_code in self.current_destinations_count else 'ne'
+            location_quality = [location_aggregate.get_quality(self.quality_type), elite]
+            if self.locations_quality_dict.get(location_code) != location_quality:
+                self.locations_quality_dict[location_code] = location_quality
+                self.stale_locations.add(location_code)
+        self.modified_locations = set()
+
+        # Se vuelven a generar las líneas anteriores de las locaciones que cambiaron
+        rendered_count = len(self.stn_lines)
+        if refresh_previous:
+            stale_trajectories = set()
+            for location_code in self.stale_locations:
+                stale_trajectories.update(trajectory_index for trajectory_index in self.locations_trajectories[location_code] if trajectory_index < rendered_count)
+            for trajectory_index in stale_trajectories:
+                self.stn_lines[trajectory_index] = self._generate_stn_line(trajectory_index)
+            self.stale_locations = set()
+
+        # Se generan las líneas de las trayectorias nuevas
+        new_stn_lines = [self._generate_stn_line(trajectory_index) for trajectory_index in range(rendered_count, len(self.trajectories))]
+        self.stn_lines.extend(new_stn_lines)
+
+        return new_stn_lines
+
+# Función para seguir los archivos de trayectorias y actualizar el archivo STN mientras irace se ejecuta
+def follow_trajectories_to_stn_format(
+    folder_path: str,
+    file_extension: str,
+    output_file_path: str,
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ],
+    quality_type: str,
+    significant_digits: int,
+    show_elites: bool,
+    show_iterations: bool = False,
+    show_configurations: bool = False,
+    update_interval: float = 60.0,
+    completion_suffix: str = '.done',
+    completion_check: Callable[[], bool] | None = None,
+    write_delta: bool = False,
+    max_updates: int | None = None
+) -> list[str]:
+    """
+    Sigue los archivos de trayectorias de irace de una carpeta y actualiza el archivo en formato STN cada
+    update_interval segundos, procesando solo las líneas nuevas.
+
+    Las configuraciones de destino de la iteración en curso de cada ejecución se muestran como élites, igual
+    que en la conversión completa de los archivos hasta ese momento. Una ejecución solo se considera terminada
+    con una señal explícita: su archivo centinela (ruta del archivo + completion_suffix) o completion_check()
+    devolviendo verdadero, que termina todas las ejecuciones. Que los archivos no cambien no detiene el
+    seguimiento; este termina cuando todas las ejecuciones detectadas han terminado, cuando completion_check()
+    devuelve verdadero (aunque no se haya detectado ningún archivo), tras max_updates actualizaciones o con una
+    interrupción (Ctrl+C), escribiendo el archivo STN completo.
+
+    Args:
+        folder_path (str): Ruta de la carpeta con los archivos de trayectorias de irace.
+        file_extension (str): Extensión de archivo a buscar (por ejemplo, ".txt").
+        output_file_path (str): Ruta del archivo de salida en formato STN.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+        quality_type (str) : Tipo de calidad a considerar para las locaciones ('mean', 'min' o 'max').
+        significant_digits (int) : Cantidad de dígitos significativos para la calidad.
+        show_elites (bool) : Indica si se deben mostrar las configuraciones élites en el archivo STN.
+        show_iterations (bool) : Indica si se deben mostrar las iteraciones en el archivo STN.
+        show_configurations (bool) : Indica si se deben mostrar las configuraciones en el archivo STN.
+        update_interval (float) : Segundos entre cada actualización.
+        completion_suffix (str) : Sufijo del archivo centinela que indica que una ejecución terminó (por ejemplo, 'trajectories_128.txt.done').
+        completion_check (Callable) : Función sin argumentos que devuelve verdadero cuando toda la campaña terminó.
+        write_delta (bool) : Si es verdadero, en cada actualización solo se añaden al archivo las trayectorias
+            nuevas (con las calidades de ese momento) en lugar de reescribirlo; al terminar se reescribe completo.
+        max_updates (int) : Cantidad máxima de actualizaciones antes de terminar (None para no limitar).
+
+    Las líneas con errores se omiten y los archivos truncados o eliminados se dejan de seguir, informándolos al
+    final. El archivo STN completo se escribe siempre al terminar, también tras un error inesperado.
+
+    Returns:
+        List[str]: Lista de líneas en formato STN de la escritura final.
+    """
+    follower = None
+    stn_format_files = []
+    try:
+        # Validación de los formatos y opciones
+        validate_stn_arguments(parameters_format, locations_format, quality_type, significant_digits, show_elites)
+        if update_interval < 0:
+            raise ValueError("El intervalo de actualización no puede ser negativo.")
+
+        stn_header = generate_stn_header(show_elites, show_iterations, show_configurations)
+        follower = Trajectories_Follower(
+            folder_path, file_extension, parameters_format, locations_format, quality_type, completion_suffix,
+            significant_digits, show_elites, show_iterations, show_configurations
+        )
+        updates = 0
+
+        print(f'Inicio del seguimiento de la carpeta {folder_path}...')
+
+        while True:
+            start_time = time.time()
+
+            # Se evalúa la señal de término antes de leer, para no perder líneas escritas justo antes
+            campaign_completed = completion_check is not None and completion_check()
+
+            new_trajectories = follower.poll()
+            completed_runs = follower.complete_runs(None if campaign_completed else [])
+            updates += 1
+
+            # La señal de la campaña termina el seguimiento aunque no se haya detectado ningún archivo
+            if campaign_completed or follower.is_complete() or (max_updates is not None and updates >= max_updates):
+                break
+
+            # Se actualiza el archivo STN solo si hubo cambios
+            if new_trajectories > 0 or completed_runs > 0:
+                if write_delta:
+                    written_count = len(follower.get_stn_lines())
+                    new_stn_lines = follower.update_stn_lines(refresh_previous=False)
+                    with open(output_file_path, 'a' if written_count > 0 else 'w') as file:
+                        if written_count == 0:
+                            file.write(stn_header + '\n')
+                        for line in new_stn_lines:
+                            file.write(line + '\n')
+                else:
+                    follower.update_stn_lines()
+                    write_stn_file(output_file_path, [stn_header] + follower.get_stn_lines())
+
+                end_time = time.time()
+                print(f'Actualización {updates}: {new_trajectories} trayectorias nuevas, {follower.get_trajectories_count()} en total, {len(follower.get_locations_aggregates())} locaciones. Tiempo: {end_time - start_time} segundos.')
+
+            time.sleep(update_interval)
+    except KeyboardInterrupt:
+        print('Seguimiento interrumpido, se escribe el estado actual.')
+    except Exception as e:
+        print(f'Error en el seguimiento de las trayectorias a formato STN: {e}')
+    finally:
+        # Escritura completa y atómica del archivo final con el estado leído hasta el momento
+        if follower is not None:
+            try:
+                follower.update_stn_lines()
+                stn_format_files = [stn_header] + follower.get_stn_lines()
+                write_stn_file(output_file_path, stn_format_files)
+            except Exception as e:
+                print(f'Error al escribir el archivo STN final: {e}')
+                stn_format_files = []
+
+            if follower.get_skipped_files() or follower.get_skipped_lines():
+                print(f'Se omitieron {len(follower.get_skipped_files())} archivos y {len(follower.get_skipped_lines())} líneas con errores.')
+        print('Fin del seguimiento de las trayectorias a formato STN.')
+
+    return stn_format_files
@@ -0,0 +1,272 @@
+import os, random, time
+from .Trajectories_Classes import Parameter_Format, Location_Format, Location_Aggregate
+from .Trajectories_Interpreter import (
+    validate_stn_arguments,
+    read_trajectories_files_folder,
+    parse_trajectory_line,
+    calculate_locations_quality,
+    generate_stn_header,
+    generate_stn_line,
+    write_stn_file,
+)
+
+# Función para estimar la cantidad total de locaciones a partir de sus frecuencias en una muestra
+def estimate_locations_count(
+    locations_frequencies: dict[str, int],
+    sampling_fraction: float
+) -> float:
+    """
+    Estima la cantidad total de locaciones distintas a partir de una muestra de trayectorias. Las locaciones
+    observadas más de una vez se consideran cubiertas, mientras que las observadas una sola vez (f1) se
+    extrapolan según la fracción muestreada: total = observadas + f1 * (1 / fracción - 1).
+
+    Args:
+        locations_frequencies (dict): Diccionario { locación: cantidad de configuraciones en la muestra }.
+        sampling_fraction (float): Fracción de las trayectorias totales que fue muestreada (0, 1].
+
+    Returns:
+        float: Cantidad estimada de locaciones distintas.
+    """
+    if sampling_fraction <= 0:
+        raise ValueError("La fracción muestreada debe ser positiva.")
+    observed = len(locations_frequencies)
+    f1 = sum(1 for frequency in locations_frequencies.values() if frequency == 1)
+    return observed + f1 * (1 / min(sampling_fraction, 1.0) - 1)
+
+# Función para muestrear las líneas de un archivo de trayectorias por iteración
+def sample_trajectories_file(
+    file_path: str,
+    edges_per_iteration: int,
+    rng: random.Random
+) -> tuple[list[tuple[int, int, str]], int]:
+    """
+    Recorre un archivo de trayectorias y conserva, por cada iteración, una muestra uniforme de a lo más
+    edges_per_iteration líneas (muestreo de reservorio). Siempre se conserva una línea por cada configuración de
+    origen élite de la iteración y todas las líneas de la última iteración. Las líneas no se castean, solo se lee
+    su iteración, el identificador y el estado élite del origen.
+
+    La última iteración no se guarda mientras se recorre el archivo: se recuerda la posición (en bytes) donde
+    comienza la iteración en curso y, al terminar, se vuelve a leer desde ahí en una segunda pasada.
+
+    Args:
+        file_path (str): Ruta del archivo de trayectorias.
+        edges_per_iteration (int): Tamaño del reservorio por iteración.
+        rng (random.Random): Generador de números aleatorios.
+
+    Returns:
+        tuple: Lista de (iteración, índice de línea, línea) en orden del archivo y cantidad total de trayectorias.
+    """
+    sampled_lines = []
+    reservoir = []
+    seen = 0
+    iteration = 1
+    line_index = 0
+
+    # Línea de la primera aparición de cada configuración de origen élite de la iteración en curso
+    # Ejemplo: { id: (iteración, índice de línea, línea), ... }
+    elite_lines = {}
+
+    with open(file_path, 'rb') as file:
+
+        # Se omite la primera línea del archivo (encabezado)
+        offset = len(file.readline())
+
+        # Posición e índice de la primera línea de la iteración en curso
+        iteration_offset = offset
+        iteration_line_index = 1
+
+        for line_index, raw_line in enumerate(file, start=1):
+            line_offset = offset
+            offset += len(raw_line)
+            line = raw_line.decode()
+
+            trajectory_blocks = line.split('|')
+            if len(trajectory_blocks) != 2:
+                raise ValueError(f"El archivo '{file_path}' no contiene dos bloques de trayectorias en la línea {line_index}.")
+            origin_values = trajectory_blocks[0].split()
+
+            # Se cierra la muestra de la iteración anterior
+            if int(origin_values[-2]) > iteration:
+                sampled_lines.extend(elite_lines.values())
+                sampled_lines.extend(reservoir)
+                iteration += 1
+                reservoir = []
+                elite_lines = {}
+                seen = 0
+                iteration_offset = line_offset
+                iteration_line_index = line_index
+
+            entry = (iteration, line_index, line)
+
+            # Cada configuración de origen élite aparece al menos una vez
+            if origin_values[-3] == 'e' and origin_values[0] not in elite_lines:
+                elite_lines[origin_values[0]] = entry
+                continue
+
+            # Muestreo de reservorio (algoritmo R)
+            seen += 1
+            if len(reservoir) < edges_per_iteration:
+                reservoir.append(entry)
+            else:
+                replace_index = rng.randrange(seen)
+                if replace_index < edges_per_iteration:
+                    reservoir[replace_index] = entry
+
+        # La última iteración se conserva completa, volviendo a leerla desde su posición
+        file.seek(iteration_offset)
+        for final_line_index, raw_line in enumerate(file, start=iteration_line_index):
+            sampled_lines.append((iteration, final_line_index, raw_line.decode()))
+
+    sampled_lines.sort(key=lambda entry: entry[1])
+
+    return sampled_lines, line_index
+
+# Función para generar una vista previa en formato STN a partir de una muestra de las trayectorias
+def preview_trajectories_to_stn_format(
+    folder_path: str,
+    file_extension: str,
+    output_file_path: str,
+    parameters_format: list[ Parameter_Format ],
+    locations_format: list[ Location_Format ],
+    quality_type: str,
+    significant_digits: int,
+    show_elites: bool,
+    show_iterations: bool = False,
+    show_configurations: bool = False,
+    edges_per_iteration: int = 20,
+    max_files: int | None = 10,
+    seed: int | None = None
+) -> dict:
+    """
+    Genera un archivo STN representativo a partir de una muestra estratificada de las trayectorias, para
+    explorar campañas muy grandes sin realizar la conversión completa.
+
+    Se muestrean a lo más max_files ejecuciones y, por cada ejecución e iteración, a lo más edges_per_iteration
+    trayectorias (muestreo de reservorio), conservando siempre una trayectoria por cada configuración de origen
+    élite de la iteración y todas las de la última iteración. Como en la conversión completa, una locación es
+    élite si alguna de sus configuraciones lo es. Solo las líneas muestreadas se castean y se localizan, por lo
+    que la memoria queda acotada por el tamaño de la muestra y el tiempo por la cantidad de archivos muestreados.
+    Los archivos se ordenan por nombre antes de muestrear, de modo que una misma semilla elige las mismas
+    ejecuciones aunque la campaña se copie o se mueva; los números de ejecución siguen ese orden (posición del
+    archivo + 1), que puede no coincidir con el de la conversión completa.
+
+    Args:
+        folder_path (str): Ruta de la carpeta con los archivos de trayectorias de irace.
+        file_extension (str): Extensión de archivo a buscar (por ejemplo, ".txt").
+        output_file_path (str): Ruta del archivo de salida en formato STN.
+        parameters_format (list[]) : Formato de los parámetros del algoritmo.
+        locations_format (list[]) : Formato de las locaciones del algoritmo.
+        quality_type (str) : Tipo de calidad a considerar para las locaciones ('mean', 'min' o 'max').
+        significant_digits (int) : Cantidad de dígitos significativos para la calidad.
+        show_elites (bool) : Indica si se deben mostrar las configuraciones élites en el archivo STN.
+        show_iterations (bool) : Indica si se deben mostrar las iteraciones en el archivo STN.
+        show_configurations (bool) : Indica si se deben mostrar las configuraciones en el archivo STN.
+        edges_per_iteration (int) : Cantidad máxima de trayectorias muestreadas por ejecución e iteración.
+        max_files (int) : Cantidad máxima de archivos (ejecuciones) a muestrear (None para todos, de forma explícita).
+        seed (int) : Semilla para que la muestra sea reproducible.
+    Returns:
+        dict: Resumen de la vista previa con las llaves 'stn_lines', 'sampled_files', 'total_files',
+            'sampled_edges', 'estimated_edges', 'sampled_locations' y 'estimated_locations'.
+            Si ocurre un error se devuelve un diccionario vacío.
+    """
+    try:
+        # Validación de los formatos y opciones
+        validate_stn_arguments(parameters_format, locations_format, quality_type, significant_digits, show_elites)
+        if edges_per_iteration <= 0:
+            raise ValueError("La cantidad de trayectorias por iteración debe ser positiva.")
+        elif max_files is not None and max_files <= 0:
+            raise ValueError("La cantidad máxima de archivos debe ser positiva.")
+
+        rng = random.Random(seed)
+
+        # Leer los archivos desde la carpeta (ordenados por nombre, para que la semilla no dependa del sistema
+        # de archivos) y seleccionar la muestra de ejecuciones
+        file_paths = sorted(read_trajectories_files_folder(folder_path, file_extension), key=os.path.basename)
+        file_indexes = list(range(len(file_paths)))
+        if max_files is not None and max_files < len(file_paths):
+            file_indexes = sorted(rng.sample(file_indexes, max_files))
+
+        print(f'Inicio de la vista previa con {len(file_indexes)} de {len(file_paths)} archivos...')
+
+        start_time = time.time()
+
+        # Lista de trayectorias muestreadas
+        # Ejemplo: [ (run, configuración de origen, configuración de destino), ... ]
+        sampled_trajectories = []
+
+        # Cantidad de trayectorias y bytes de los archivos muestreados, para estimar el total
+        sampled_files_edges = 0
+        sampled_files_bytes = 0
+
+        for file_index in file_indexes:
+            file_path = file_paths[file_index]
+            sampled_lines, file_edges = sample_trajectories_file(file_path, edges_per_iteration, rng)
+            sampled_files_edges += file_edges
+            sampled_files_bytes += os.path.getsize(file_path)
+
+            # Solo se castean las líneas muestreadas
+            file_trajectories = []
+            for iteration, line_index, line in sampled_lines:
+                origin_configuration, destination_configuration = parse_trajectory_line(line, parameters_format, file_index, file_path, line_index)
+                file_trajectories.append((iteration, origin_configuration, destination_configuration))
+
+            # Se identifica como élites las configuraciones de destino de la última iteración
+            if file_trajectories:
+                final_iteration = file_trajectories[-1][0]
+                for iteration, _, destination_configuration in file_trajectories:
+                    if iteration == final_iteration:
+                        destination_configuration.set_elite_state('e')
+
+            sampled_trajectories.extend((file_index + 1, origin, destination) for _, origin, destination in file_trajectories)
+
+        # Se generan las locaciones de la muestra
+        locations_aggregates = {}
+        for _, origin_configuration, destination_configuration in sampled_trajectories:
+            for configuration in (origin_configuration, destination_configuration):
+                location_code = configuration.generate_location_code(parameters_format, locations_format)
+                if location_code not in locations_aggregates:
+                    locations_aggregates[location_code] = Location_Aggregate(location_code)
+                locations_aggregates[location_code].add_configuration(configuration)
+
+        # Se genera el archivo en formato STN de la muestra
+        locations_quality_dict = calculate_locations_quality(locations_aggregates, quality_type)
+        stn_format_files = [generate_stn_header(show_elites, show_iterations, show_configurations)]
+        for run, origin_configuration, destination_configuration in sampled_trajectories:
+            stn_format_files.append(generate_stn_line(
+                run, origin_configuration, destination_configuration, locations_quality_dict,
+                parameters_format, locations_format, significant_digits,
+                show_elites, show_iterations, show_configurations
+            ))
+        write_stn_file(output_file_path, stn_format_files)
+
+        # Estimación de los totales, extrapolando por tamaño los archivos no muestreados
+        estimated_edges = float(sampled_files_edges)
+        if len(file_indexes) < len(file_paths) and sampled_files_bytes > 0:
+            sampled_file_indexes = set(file_indexes)
+            remaining_bytes = sum(os.path.getsize(file_path) for i, file_path in enumerate(file_paths) if i not in sampled_file_indexes)
+            estimated_edges += remaining_bytes * sampled_files_edges / sampled_files_bytes
+        locations_frequencies = {location_code: location_aggregate.get_count() for location_code, location_aggregate in locations_aggregates.items()}
+        sampling_fraction = len(sampled_trajectories) / estimated_edges if estimated_edges > 0 else 1.0
+
+        preview_report = {
+            'stn_lines': stn_format_files,
+            'sampled_files': len(file_indexes),
+            'total_files': len(file_paths),
+            'sampled_edges': len(sampled_trajectories),
+            'estimated_edges': round(estimated_edges),
+            'sampled_locations': len(locations_aggregates),
+            'estimated_locations': round(estimate_locations_count(locations_frequencies, sampling_fraction)) if locations_frequencies else 0,
+        }
+
+        end_time = time.time()
+
+        print(f'Trayectorias muestreadas: {preview_report["sampled_edges"]} de ~{preview_report["estimated_edges"]} estimadas.')
+        print(f'Locaciones muestreadas: {preview_report["sampled_locations"]} de ~{preview_report["estimated_locations"]} estimadas.')
+        print(f'Fin de la vista previa. Tiempo total: {end_time - start_time} segundos.')
+
+        return preview_report
+    except Exception as e:
+        print(f'Error en la vista previa de las trayectorias a formato STN: {e}')
+        return {}
+    finally:
+        print('Fin del proceso de vista previa de las trayectorias a formato STN.')
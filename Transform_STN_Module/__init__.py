@@ -1,14 +1,27 @@
 # Transform_STN_Module/__init__.py
 
 # Importa funciones específicas de módulo de funciones de asignación de eventos
-from .Trajectories_Interpreter import trajectories_to_stn_format
+from .Trajectories_Interpreter import trajectories_to_stn_format, trajectories_to_database
 
-from .Trajectories_Classes import Parameter, Parameter_Format, Location_Format, Configuration
+from .Trajectories_Live import follow_trajectories_to_stn_format, Trajectories_Follower
+
+from .Trajectories_Preview import preview_trajectories_to_stn_format
+
+from .Locations_Index import Locations_Index, coarsen_stn_lines
+
+from .Trajectories_Classes import Parameter, Parameter_Format, Location_Format, Configuration, Location_Aggregate
 
 __all__ = [
     'trajectories_to_stn_format',
+    'trajectories_to_database',
+    'follow_trajectories_to_stn_format',
+    'Trajectories_Follower',
+    'preview_trajectories_to_stn_format',
+    'Locations_Index',
+    'coarsen_stn_lines',
     'Parameter',
     'Parameter_Format',
     'Location_Format',
     'Configuration',
-]
\ No newline at end of file
+    'Location_Aggregate',
+]